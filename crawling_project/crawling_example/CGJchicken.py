@@ -1,56 +1,82 @@
-import urllib.request
 from bs4 import BeautifulSoup
 import pandas as pd
 import datetime
-import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from urllib.parse import urlparse
 
+from fetcher import fetch, fetch_text, print_fetch_report
 
-def get_request_url(url, enc='utf-8'):
-    req = urllib.request.Request(url)
-
-    try:
-        ssl._create_default_https_context = ssl._create_unverified_context
-
-        response = urllib.request.urlopen(req)
-        if response.getcode() == 200:
-            try:
-                rcv = response.read()
-                ret = rcv.decode(enc)
-            except UnicodeDecodeError:
-                ret = rcv.decode(enc, 'replace')
+CHEOGAJIP_URL = 'http://www.cheogajip.co.kr/bbs/board.php?bo_table=store&page=%s'
+CHEOGAJIP_LAST_PAGE = 125
 
-            return ret
 
-    except Exception as e:
-        print(e)
+def get_request_url(url, enc='utf-8'):
+    ret = fetch_text(url, enc=enc)
+    if ret is None:
         print("[%s] Error for URL : %s" % (datetime.datetime.now(), url))
-        return None
-
-
-def CheogajipAddress(result):
-    for page_idx in range(0, 125):  # 마지막 페이지까지
-        Cheogajip_URL = (
-            'http://www.cheogajip.co.kr/bbs/board.php?bo_table=store&page=%s' % str(page_idx + 1)
-        )
-        print(Cheogajip_URL)
-
-        response = urllib.request.urlopen(Cheogajip_URL)
-        soupData = BeautifulSoup(response, 'html.parser')
-        tbody_tag = soupData.find('tbody')
-
-        for store_tr in tbody_tag.find_all('tr'):
-            tr_tag = list(store_tr.strings)
-            store_name = tr_tag[1]
-            store_address = tr_tag[3]
-            store_sido_gu = store_address.split()[:2]
-            store_phone = tr_tag[5]
-            result.append([store_name] + store_sido_gu + [store_address, store_phone])
-
-def cswin_Cheogajip():
+    return ret
+
+
+def parse_store_rows(html):
+    soupData = BeautifulSoup(html, 'html.parser')
+    tbody_tag = soupData.find('tbody')
+
+    rows = []
+    for store_tr in tbody_tag.find_all('tr'):
+        tr_tag = list(store_tr.strings)
+        store_name = tr_tag[1]
+        store_address = tr_tag[3]
+        store_sido_gu = store_address.split()[:2]
+        store_phone = tr_tag[5]
+        rows.append([store_name] + store_sido_gu + [store_address, store_phone])
+    return rows
+
+
+def get_store_page(page_no, host_slots=None):
+    Cheogajip_URL = CHEOGAJIP_URL % str(page_no)
+    print(Cheogajip_URL)
+
+    # 호스트별 동시 접속 수 제한 (병렬 모드에서만 사용)
+    slot = host_slots.get(urlparse(Cheogajip_URL).netloc) if host_slots else None
+    with slot or nullcontext():
+        response = fetch(Cheogajip_URL)
+        response.raise_for_status()
+        html = response.content
+    return parse_store_rows(html)
+
+
+def CheogajipAddress(result, workers=1, max_per_host=4):
+    """
+    매장 게시판 전체 페이지 수집.
+    workers > 1 이면 스레드 풀로 동시에 요청하되, 결과는 페이지 순서대로 result에 붙인다.
+    """
+    pages = range(1, CHEOGAJIP_LAST_PAGE + 1)  # 마지막 페이지까지
+    started = time.perf_counter()
+
+    if workers <= 1:
+        for page_no in pages:
+            result.extend(get_store_page(page_no))
+    else:
+        hosts = {urlparse(CHEOGAJIP_URL % page_no).netloc for page_no in pages}
+        host_slots = {host: threading.BoundedSemaphore(max_per_host) for host in hosts}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map은 제출 순서대로 결과를 돌려주므로 직렬 실행과 같은 행 순서가 유지된다
+            for rows in executor.map(lambda p: get_store_page(p, host_slots), pages):
+                result.extend(rows)
+
+    elapsed = time.perf_counter() - started
+    print('%d pages in %.2fs (%.1f pages/s, workers=%d)'
+          % (len(pages), elapsed, len(pages) / elapsed if elapsed else 0.0, workers))
+
+def cswin_Cheogajip(workers=8, max_per_host=4):
     result = []
 
     print('CHEOGAJIP ADDRESS CRAWLING START')
-    CheogajipAddress(result)
+    CheogajipAddress(result, workers=workers, max_per_host=max_per_host)
     cheogajip_table = pd.DataFrame(
         result,
         columns=('store', 'sido', 'gungu', 'store_address', 'store_phone'),
@@ -59,6 +85,7 @@ def cswin_Cheogajip():
     del result[:]
 
     print('FINISHED')
+    print_fetch_report()
 
 
 if __name__ == '__main__':
@@ -1,9 +1,9 @@
 import os
-import urllib.request
-import json
 import csv
 from dotenv import load_dotenv
 
+from fetcher import fetch_json
+
 load_dotenv()
 
 def search_naver_blog(query, display=100):
@@ -14,26 +14,14 @@ def search_naver_blog(query, display=100):
         print("NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET을 설정")
         return None
     
-    encText = urllib.parse.quote(query)
-    url = f"https://openapi.naver.com/v1/search/blog?query={encText}&display={display}"
-    
-    request = urllib.request.Request(url)
-    request.add_header("X-Naver-Client-Id", client_id)
-    request.add_header("X-Naver-Client-Secret", client_secret)
+    url = "https://openapi.naver.com/v1/search/blog"
+    params = {"query": query, "display": display}
+    headers = {
+        "X-Naver-Client-Id": client_id,
+        "X-Naver-Client-Secret": client_secret,
+    }
     
-    try:
-        response = urllib.request.urlopen(request)
-        rescode = response.getcode()
-        
-        if rescode == 200:
-            response_body = response.read()
-            return json.loads(response_body.decode('utf-8'))
-        else:
-            print(f"Error Code: {rescode}")
-            return None
-    except Exception as e:
-        print(f"오류 발생: {e}")
-        return None
+    return fetch_json(url, params=params, headers=headers)
 
 def remove_html_tags(text):
     import re
@@ -1,27 +1,34 @@
 import os
-import urllib.request
-import json
 import csv
 import xml.etree.ElementTree as ET
+import requests
 from dotenv import load_dotenv
 
+from fetcher import fetch
+
 load_dotenv()
 
+SERVICE_NAME = "ChunmanFreeSuggestions"
+
+def is_success_result(response):
+    """RESULT.CODE가 INFO-000인 응답만 캐시 (인증키 오류·데이터 없음 등은 저장하지 않음)"""
+    data = response.json()
+    result = data.get(SERVICE_NAME, data)
+    return result['RESULT']['CODE'] == 'INFO-000'
+
 def get_free_suggestions(start_index=1, end_index=1000, api_key=None):
     if not api_key:
         api_key = os.getenv("SEOUL_API_KEY")
     
-    service_name = "ChunmanFreeSuggestions"
+    service_name = SERVICE_NAME
     file_type = "json"
     url = f"http://openAPI.seoul.go.kr:8088/{api_key}/{file_type}/{service_name}/{start_index}/{end_index}"
     
     try:
-        request = urllib.request.Request(url)
-        response = urllib.request.urlopen(request)
+        response = fetch(url, cache_if=is_success_result)
         
-        if response.getcode() == 200:
-            response_body = response.read()
-            data = json.loads(response_body.decode('utf-8'))
+        if response.status_code == 200:
+            data = response.json()
             
             if service_name in data:
                 result = data[service_name]
@@ -43,14 +50,11 @@ def get_free_suggestions(start_index=1, end_index=1000, api_key=None):
                 print("예상하지 못한 응답 형식입니다.")
                 return []
         else:
-            print(f"HTTP 오류 코드: {response.getcode()}")
+            print(f"HTTP 오류 코드: {response.status_code}")
             return []
             
-    except urllib.error.HTTPError as e:
-        print(f"HTTP 오류 발생: {e.code} - {e.reason}")
-        return []
-    except urllib.error.URLError as e:
-        print(f"URL 오류 발생: {e.reason}")
+    except requests.RequestException as e:
+        print(f"요청 오류 발생: {e}")
         return []
     except Exception as e:
         print(f"오류 발생: {e}")
@@ -1,6 +1,8 @@
-import requests
+import argparse
 import csv
+import math
 import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from urllib.parse import unquote
 from dotenv import load_dotenv
@@ -8,6 +10,9 @@ import pandas as pd
 import folium
 import webbrowser
 
+from fetcher import fetch, print_fetch_report
+from response_cache import FOREVER
+
 load_dotenv()
 
 SIDO_CODES = {
@@ -58,7 +63,16 @@ SEOUL_GUGUN_CODES = {
     "260": "중랑구",
 }
 
+def is_valid_result(response):
+    """정상(00)·데이터 없음(03) 응답만 캐시 (인증/호출 한도 오류는 저장하지 않음)"""
+    return response.json().get("resultCode") in ("00", "03")
+
+
 def fetch_accident_data(auth_key, year, sido_code, gugun_code="", num_of_rows=100, page_no=1):
+    """
+    한 페이지 조회. 정상(00)과 데이터 없음(03)은 응답 dict 그대로 (03은 항목 0건),
+    요청 실패나 API 오류는 None.
+    """
     url = "https://opendata.koroad.or.kr/data/rest/frequentzone/bicycle"
     
     auth_key = unquote(auth_key)
@@ -75,8 +89,11 @@ def fetch_accident_data(auth_key, year, sido_code, gugun_code="", num_of_rows=10
     if gugun_code:
         params["guGun"] = gugun_code
     
+    # 지난 해 이전 자료는 다시 바뀌지 않으므로 만료 없이 캐시
+    cache_ttl = FOREVER if int(year) < datetime.now().year - 1 else None
+    
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = fetch(url, params=params, cache_ttl=cache_ttl, cache_if=is_valid_result)
         
         if response.status_code != 200:
             print(f"HTTP 오류: {response.status_code}")
@@ -86,11 +103,8 @@ def fetch_accident_data(auth_key, year, sido_code, gugun_code="", num_of_rows=10
         result_code = data.get("resultCode", "")
         result_msg = data.get("resultMsg", "")
         
-        if result_code == "00":
+        if result_code in ("00", "03"):
             return data
-        elif result_code == "03":
-            print(f"데이터 없음: {result_msg}")
-            return None
         else:
             print(f"API 오류 - 코드: {result_code}, 메시지: {result_msg}")
             return None
@@ -99,51 +113,152 @@ def fetch_accident_data(auth_key, year, sido_code, gugun_code="", num_of_rows=10
         print(f"오류 발생: {e}")
         return None
 
-def fetch_all_accident_data(auth_key, year, sido_code, gugun_code="", num_of_rows=100):
-    all_items = []
-    page_no = 1
+MAX_NUM_OF_ROWS = 1000  # 한 번에 요청해 볼 최대 행 수 (API가 더 적게 주면 그 값에 맞춘다)
+
+def plan_pages(data, requested_rows):
+    """
+    1페이지 응답으로 실제 페이지 크기와 마지막 페이지 번호를 계산한다.
+    API가 요청한 numOfRows보다 적게 돌려주면 돌려받은 건수를 페이지 크기로 쓴다.
+    """
+    item_count = len(extract_items(data))
+    total_count = int(data.get("totalCount", 0))
+    page_size = min(requested_rows, int(data.get("numOfRows") or requested_rows))
+    if item_count < min(page_size, total_count):
+        page_size = item_count
+    if page_size <= 0:
+        return 0, 1
+    return page_size, math.ceil(total_count / page_size)
+
+def fetch_all_accident_data(auth_key, year, sido_code, gugun_code="", num_of_rows=None, max_workers=4):
+    """
+    1페이지의 totalCount/numOfRows로 전체 페이지를 미리 계산하고 나머지 페이지는 동시에 요청한다.
+    num_of_rows를 지정하지 않으면 MAX_NUM_OF_ROWS부터 시도해서 요청 횟수를 줄인다.
+    """
+    requested_rows = num_of_rows or MAX_NUM_OF_ROWS
     
     print(f"\n{year}년 자전거 사고 다발지역 데이터 수집 중...")
     print(f"시도코드: {sido_code}, 시군구코드: {gugun_code if gugun_code else '전체'}")
+    print("페이지 1 조회 중...", end=" ")
     
-    while True:
-        print(f"페이지 {page_no} 조회 중...", end=" ")
-        
-        data = fetch_accident_data(auth_key, year, sido_code, gugun_code, num_of_rows, page_no)
-        
-        if not data:
-            print("조회 종료")
-            break
-        
-        items = data.get("items", {})
-        
-        if isinstance(items, dict):
-            item_list = items.get("item", [])
-        elif isinstance(items, list):
-            item_list = items
-        else:
-            item_list = []
-        
-        if isinstance(item_list, dict):
-            item_list = [item_list]
-        
-        if not item_list:
-            print("더 이상 데이터 없음")
-            break
-        
-        all_items.extend(item_list)
-        print(f"{len(item_list)}건 수집 (누적: {len(all_items)}건)")
-        
-        total_count = data.get("totalCount", 0)
-        if len(all_items) >= total_count:
-            print(f"전체 데이터 수집 완료: 총 {len(all_items)}건")
-            break
-        
-        page_no += 1
+    first = fetch_accident_data(auth_key, year, sido_code, gugun_code, requested_rows, 1)
+    if not first:
+        print("조회 종료")
+        return []
+    
+    all_items = extract_items(first)
+    total_count = int(first.get("totalCount") or 0)
+    if first.get("resultCode") == "03" or total_count == 0:
+        print(f"데이터 없음: {first.get('resultMsg', '')}")
+        return []
+    page_size, last_page = plan_pages(first, requested_rows)
+    print(f"{len(all_items)}건 수집 (전체 {total_count}건, 페이지당 {page_size}건, {last_page}페이지)")
+    
+    if last_page > 1:
+        pages = range(2, last_page + 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda page_no: fetch_accident_data(auth_key, year, sido_code, gugun_code, page_size, page_no),
+                pages
+            )
+            for page_no, data in zip(pages, results):
+                if not data:
+                    print(f"페이지 {page_no} 조회 실패")
+                    continue
+                all_items.extend(extract_items(data))
+    
+    if len(all_items) >= total_count:
+        print(f"전체 데이터 수집 완료: 총 {len(all_items)}건")
+    else:
+        print(f"일부 페이지 누락: {len(all_items)}/{total_count}건")
     
     return all_items
 
-def save_to_csv(data, filename):
+def extract_items(data):
+    items = data.get("items", {})
+    
+    if isinstance(items, dict):
+        item_list = items.get("item", [])
+    elif isinstance(items, list):
+        item_list = items
+    else:
+        item_list = []
+    
+    if isinstance(item_list, dict):
+        item_list = [item_list]
+    
+    return item_list
+
+def fetch_hotspots_batch(auth_key, years, sido_code, gugun_codes=("",), num_of_rows=MAX_NUM_OF_ROWS,
+                         max_workers=8):
+    """
+    (연도, 시군구, 페이지) 요청을 스레드 풀에서 동시에 처리한다.
+    요청 속도는 fetcher의 호스트별 토큰 버킷이 맞추고, 1페이지 응답의 totalCount로 나머지 페이지를 바로 예약한다.
+    결과는 afos_fid 기준으로 합치며, 같은 지점이 여러 연도에 있으면 최신 연도 자료를 남긴다.
+    실패한 (연도, 시군구, 페이지)는 바로 출력하고, 끝에 조합별로 totalCount보다 적게 받은 것을 알려 준다.
+    """
+    merged = {}
+    expected = {}   # (연도, 시군구): 1페이지의 totalCount
+    received = {}   # (연도, 시군구): 받은 행 수 (합치기 전)
+    failed = []     # 실패한 (연도, 시군구, 페이지)
+    
+    def fetch_page(year, gugun_code, rows, page_no):
+        return fetch_accident_data(auth_key, year, sido_code, gugun_code, rows, page_no)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {
+            executor.submit(fetch_page, year, gugun_code, num_of_rows, 1): (year, gugun_code, 1)
+            for year in years for gugun_code in gugun_codes
+        }
+        print(f"{len(pending)}개 (연도, 시군구) 조합 조회 시작...")
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                year, gugun_code, page_no = pending.pop(future)
+                data = future.result()
+                if not data:
+                    failed.append((year, gugun_code, page_no))
+                    print(f"{year}년 시군구 {gugun_code or '전체'} 페이지 {page_no} 조회 실패")
+                    continue
+                
+                items = extract_items(data)
+                received[(year, gugun_code)] = received.get((year, gugun_code), 0) + len(items)
+                if page_no == 1:
+                    expected[(year, gugun_code)] = int(data.get("totalCount") or 0)
+                    page_size, last_page = plan_pages(data, num_of_rows)
+                    for next_page in range(2, last_page + 1):
+                        future = executor.submit(fetch_page, year, gugun_code, page_size, next_page)
+                        pending[future] = (year, gugun_code, next_page)
+                
+                for item in items:
+                    key = item.get("afos_fid") or f"{year}-{item.get('afos_id')}"
+                    if key in merged and merged[key]["year"] >= year:
+                        continue
+                    item["year"] = year
+                    item["gugun_cd"] = gugun_code
+                    merged[key] = item
+    
+    print(f"수집 완료: 총 {len(merged)}개 다발지역")
+    report_missing_pages(expected, received, failed)
+    return list(merged.values())
+
+def report_missing_pages(expected, received, failed):
+    """(연도, 시군구)별로 totalCount보다 적게 받았거나 1페이지부터 실패한 조합을 출력"""
+    missing = []
+    for year, gugun_code, page_no in failed:
+        if page_no == 1:
+            missing.append(f"{year}년 시군구 {gugun_code or '전체'}: 1페이지 실패 (전체 건수 모름)")
+    for (year, gugun_code), total in sorted(expected.items()):
+        got = received.get((year, gugun_code), 0)
+        if got < total:
+            missing.append(f"{year}년 시군구 {gugun_code or '전체'}: {got}/{total}건")
+    
+    if missing:
+        print(f"일부 페이지 누락 ({len(failed)}개 페이지 실패):")
+        for line in missing:
+            print(f"  {line}")
+
+def save_to_csv(data, filename, extra_fields=None):
     if not data:
         print("저장할 데이터가 없습니다.")
         return
@@ -172,6 +287,10 @@ def save_to_csv(data, filename):
         "위도": "la_crd"
     }
     
+    if extra_fields:
+        headers = list(extra_fields) + headers
+        field_mapping.update(extra_fields)
+    
     with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=headers)
         writer.writeheader()
@@ -333,5 +452,37 @@ def main():
     save_to_csv(all_data, filename)
     visualize_accident_spots(filename)
 
+def batch_main(auth_key, start_year, end_year, sido_name="서울"):
+    """여러 연도 × 시군구를 한 번에 수집해서 하나의 다발지역 표로 저장"""
+    sido_code = SIDO_CODES[sido_name]
+    years = list(range(start_year, end_year + 1))
+    # 서울은 자치구별로 나눠 요청하고, 다른 시도는 시도 전체로 요청
+    gugun_codes = list(SEOUL_GUGUN_CODES) if sido_name == "서울" else [""]
+    
+    all_data = fetch_hotspots_batch(auth_key, years, sido_code, gugun_codes)
+    if not all_data:
+        print("\n수집된 데이터가 없습니다.")
+        return
+    
+    all_data.sort(key=lambda x: int(x.get("occrrnc_cnt", 0)), reverse=True)
+    filename = f"bicycle_accident_{start_year}_{end_year}_{sido_name}.csv"
+    save_to_csv(all_data, filename, extra_fields={"연도": "year", "시군구코드": "gugun_cd"})
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="자전거 사고 다발지역 수집")
+    parser.add_argument("--batch", action="store_true", help="여러 연도 × 시군구 일괄 수집 (비대화형)")
+    parser.add_argument("--start-year", type=int, default=datetime.now().year - 1)
+    parser.add_argument("--end-year", type=int, default=datetime.now().year - 1)
+    parser.add_argument("--sido", default="서울", choices=list(SIDO_CODES), help="시도명")
+    args = parser.parse_args()
+    
+    if args.batch:
+        auth_key = os.getenv("KOROAD_API_KEY")
+        if not auth_key:
+            print("API 키를 찾을 수 없습니다.")
+            print("   .env 파일에 KOROAD_API_KEY를 설정해주세요.")
+        else:
+            batch_main(auth_key, args.start_year, args.end_year, args.sido)
+    else:
+        main()
+    print_fetch_report()
@@ -1,9 +1,16 @@
-import requests
+import argparse
 import csv
 import os
-from collections import defaultdict
+import timeit
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
 
+from fetcher import fetch, print_fetch_report
+from ratelimit import sleep_backoff
+
 load_dotenv()
 
 SIDO_CODES = {
@@ -25,7 +32,12 @@ SIDO_CODES = {
     "제주특별자치도": "39"
 }
 
-def fetch_ev_stations(api_key, metro_cd):
+def is_station_list(response):
+    """충전소 목록(data가 있는 dict 또는 list) 응답만 캐시 (키 오류 등 200으로 오는 API 오류는 저장하지 않음)"""
+    data = response.json()
+    return isinstance(data, list) or (isinstance(data, dict) and 'data' in data)
+
+def fetch_ev_stations(api_key, metro_cd, use_cache=True):
     url = "https://bigdata.kepco.co.kr/openapi/v1/EVcharge.do"
     params = {
         "apiKey": api_key,
@@ -34,7 +46,7 @@ def fetch_ev_stations(api_key, metro_cd):
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = fetch(url, params=params, cache_ttl=None if use_cache else 0, cache_if=is_station_list)
         
         if response.status_code != 200:
             print(f"HTTP 오류: {response.status_code}")
@@ -53,35 +65,198 @@ def fetch_ev_stations(api_key, metro_cd):
         print(f"오류: {e}")
         return None
 
-def fetch_all_stations(api_key):
-    all_data = []
+def fetch_ev_stations_with_retry(api_key, metro_cd, retries=3, backoff=2.0):
+    """
+    요청이 실패했거나 응답 형식이 맞지 않을 때(None)만 지역 하나를 최대 retries번까지 다시 요청한다
+    (대기: backoff, backoff*2, ... + 지터. 네트워크 오류/5xx/429 재시도는 fetcher가 따로 한다).
+    빈 목록은 충전소가 없는 정상 응답이므로 재시도하지 않는다.
+    재시도는 캐시를 거치지 않고 네트워크로 보낸다 (예전에 캐시된 오류 응답을 다시 받지 않도록).
+    """
+    for attempt in range(1, retries + 1):
+        data = fetch_ev_stations(api_key, metro_cd, use_cache=attempt == 1)
+        if data is not None:
+            return data, attempt
+        if attempt < retries:
+            sleep_backoff(attempt - 1, base=backoff)
+    return None, retries
+
+DETAIL_FIELDNAMES = ['시도명', '시군구명', '건물명', '주소', '급속충전기', '완속충전기', '지원차종']
+
+def fetch_and_aggregate_stations(api_key, detail_filename, max_workers=4, retries=3):
+    """
+    지역 응답을 SIDO_CODES 순서대로 받아 시도별 집계에 더하고 상세 CSV에 바로 쓴 뒤 버린다.
+    동시에 요청 중인(또는 차례를 기다리는) 지역은 최대 max_workers개라서
+    메모리에 있는 충전소 목록도 최대 max_workers개 지역 분량이다.
+    반환값: (시도·시군구별 집계 DataFrame, 전체 충전소 수)
+    """
+    partials = []
+    total_count = 0
     
     print("\n전국 전기차 충전소 데이터 수집 중...")
     print("-" * 80)
     
-    for sido_name, sido_code in SIDO_CODES.items():
-        print(f"{sido_name} (코드: {sido_code}) 조회 중...", end=" ")
-        
-        data = fetch_ev_stations(api_key, sido_code)
+    with open(detail_filename, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=DETAIL_FIELDNAMES)
+        writer.writeheader()
         
-        if data:
-            count = len(data)
-            all_data.extend(data)
-            print(f"{count}개소 수집 (누적: {len(all_data)}개소)")
-        else:
-            print(f"⚠️ 실패")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            regions = iter(SIDO_CODES.items())
+            
+            while True:
+                # 앞 지역이 끝나기를 기다리는 동안에도 max_workers개까지는 미리 요청해 둔다
+                for sido_name, sido_code in regions:
+                    future = executor.submit(fetch_ev_stations_with_retry, api_key, sido_code, retries)
+                    pending.append((sido_name, sido_code, future))
+                    if len(pending) >= max_workers:
+                        break
+                if not pending:
+                    break
+                
+                sido_name, sido_code, future = pending.popleft()
+                data, attempts = future.result()
+                
+                if data is None:
+                    print(f"{sido_name} (코드: {sido_code}): ⚠️ 실패 ({attempts}회 시도)")
+                    continue
+                if not data:
+                    print(f"{sido_name} (코드: {sido_code}): 충전소 없음")
+                    continue
+                
+                partials.append(aggregate_frame(stations_to_frame(data)))
+                writer.writerows(detail_row(item) for item in data)
+                total_count += len(data)
+                print(f"{sido_name} (코드: {sido_code}): {len(data)}개소 수집 (누적: {total_count}개소)")
+                del data
     
     print("-" * 80)
-    return all_data
+    
+    if total_count == 0:
+        os.remove(detail_filename)
+    else:
+        print(f"상세 데이터 CSV 파일 저장 완료: {detail_filename}")
+        print(f"   총 {total_count}개의 충전소 데이터 저장됨")
+    
+    return merge_partial_stats(partials), total_count
+
+STAT_COLUMNS = ['충전소수', '급속충전기', '완속충전기', '전체충전기']
+
+def stations_to_frame(data):
+    """충전소 dict 목록을 열 단위 DataFrame으로 변환 (rapidCnt/slowCnt는 여기서 한 번만 숫자로 변환)"""
+    frame = pd.DataFrame.from_records(data, columns=['metro', 'city', 'rapidCnt', 'slowCnt'])
+    frame['metro'] = frame['metro'].fillna('알 수 없음')
+    frame['city'] = frame['city'].fillna('알 수 없음')
+    for column in ('rapidCnt', 'slowCnt'):
+        frame[column] = pd.to_numeric(frame[column], errors='coerce').fillna(0).astype(np.int64)
+    return frame
+
+def aggregate_frame(frame, by=('metro', 'city')):
+    """by 기준 그룹별 충전소수/급속/완속/전체 충전기 합계"""
+    grouped = frame.groupby(list(by), sort=False)
+    stats = pd.DataFrame({
+        '충전소수': grouped.size(),
+        '급속충전기': grouped['rapidCnt'].sum(),
+        '완속충전기': grouped['slowCnt'].sum(),
+    })
+    stats['전체충전기'] = stats['급속충전기'] + stats['완속충전기']
+    return stats
+
+def merge_partial_stats(partials):
+    """지역별로 나눠 계산한 집계를 하나로 합친다"""
+    if not partials:
+        index = pd.MultiIndex.from_arrays([[], []], names=['metro', 'city'])
+        return pd.DataFrame(0, index=index, columns=STAT_COLUMNS, dtype=np.int64)
+    return pd.concat(partials).groupby(level=['metro', 'city']).sum().sort_index()
+
+def metro_stats(city_stats):
+    """시군구 집계를 시도 단위로 묶는다"""
+    return city_stats.groupby(level='metro').sum()
+
+def print_statistics(stats, label='시도명', unit='시도', top_n=5, show_table=True):
+    """
+    stats: metro_stats() 또는 merge_partial_stats() 결과
+    label: 표의 이름 열 제목, unit: 제목/상위 목록에 쓰는 지역 단위 (예: '시군구명', '시군구')
+    """
+    if not show_table:
+        print_top(stats, unit, top_n)
+        return
+    
+    names = [' '.join(map(str, key)) if isinstance(key, tuple) else str(key) for key in stats.index]
+    
+    print("\n" + "="*80)
+    print(f"지역별({unit}) 전기차 충전소 통계")
+    print("="*80)
+    print(f"{label:<20} {'충전소수':>10} {'급속충전기':>12} {'완속충전기':>12} {'전체충전기':>12}")
+    print("-"*80)
+    
+    for name, row in zip(names, stats[STAT_COLUMNS].itertuples(index=False)):
+        print(f"{name:<20} {row[0]:>10,}개 {row[1]:>12,}대 {row[2]:>12,}대 {row[3]:>12,}대")
+    
+    totals = stats[STAT_COLUMNS].sum()
+    print("-"*80)
+    print(f"{'합계':<20} {totals['충전소수']:>10,}개 {totals['급속충전기']:>12,}대 "
+          f"{totals['완속충전기']:>12,}대 {totals['전체충전기']:>12,}대")
+    print("="*80)
+    
+    print_top(stats, unit, top_n)
+
+def print_top(stats, unit, top_n):
+    print(f"\n충전소 설치 상위 {top_n}개 {unit}:")
+    top = stats.nlargest(top_n, '충전소수')
+    for i, (key, row) in enumerate(top.iterrows(), 1):
+        name = ' '.join(key) if isinstance(key, tuple) else key
+        print(f"  {i}. {name}: {row['충전소수']:,}개소 "
+              f"(급속 {row['급속충전기']:,}대, 완속 {row['완속충전기']:,}대)")
+
+def save_stats_csv(stats, filename):
+    """집계 DataFrame을 합계 행과 함께 저장 (시도별/시군구별 공용)"""
+    if stats.empty:
+        print("저장할 데이터가 없습니다.")
+        return
+    
+    table = stats.reset_index().rename(columns={'metro': '시도명', 'city': '시군구명'})
+    total_row = {column: '' for column in table.columns}
+    total_row[table.columns[0]] = '합계'
+    total_row.update(stats[STAT_COLUMNS].sum().to_dict())
+    table = pd.concat([table, pd.DataFrame([total_row])], ignore_index=True)
+    table.to_csv(filename, index=False, encoding='utf-8-sig')
+    
+    print(f"\nCSV 파일 저장 완료: {filename}")
+    print(f"   총 {len(stats)}개 지역의 데이터 저장됨")
+
+def detail_row(item):
+    return {
+        '시도명': item.get('metro', ''),
+        '시군구명': item.get('city', ''),
+        '건물명': item.get('stnPlace', ''),
+        '주소': item.get('stnAddr', ''),
+        '급속충전기': item.get('rapidCnt', 0),
+        '완속충전기': item.get('slowCnt', 0),
+        '지원차종': item.get('carType', '')
+    }
+
+def make_synthetic_stations(n, seed=0):
+    """벤치마크용 가짜 충전소 데이터 (API처럼 개수 필드는 문자열)"""
+    rng = np.random.default_rng(seed)
+    metros = list(SIDO_CODES.keys())
+    metro_idx = rng.integers(0, len(metros), n).tolist()
+    city_idx = rng.integers(0, 25, n).tolist()
+    rapid = rng.integers(0, 10, n).tolist()
+    slow = rng.integers(0, 30, n).tolist()
+    return [
+        {'metro': metros[m], 'city': f"시군구{c:02d}", 'rapidCnt': str(r), 'slowCnt': str(s)}
+        for m, c, r, s in zip(metro_idx, city_idx, rapid, slow)
+    ]
 
-def aggregate_by_sido(data):
+# --- 벤치마크 비교 기준: 예전 dict 기반 시도별 집계 ---
+
+def legacy_aggregate_by_sido(data):
     sido_stats = defaultdict(lambda: {
         '충전소수': 0,
         '급속충전기': 0,
         '완속충전기': 0,
         '전체충전기': 0
     })
-    
     for item in data:
         metro = item.get('metro', '알 수 없음')
         rapid_cnt = int(item.get('rapidCnt', 0))
@@ -91,104 +266,35 @@ def aggregate_by_sido(data):
         sido_stats[metro]['급속충전기'] += rapid_cnt
         sido_stats[metro]['완속충전기'] += slow_cnt
         sido_stats[metro]['전체충전기'] += rapid_cnt + slow_cnt
-    
     return dict(sido_stats)
 
-def print_statistics(sido_stats):
-    print("\n" + "="*80)
-    print("지역별(시도) 전기차 충전소 통계")
-    print("="*80)
-    print(f"{'시도명':<20} {'충전소수':>10} {'급속충전기':>12} {'완속충전기':>12} {'전체충전기':>12}")
-    print("-"*80)
+def benchmark_aggregation(n=500_000, repeat=3):
+    """dict 기반 집계(legacy_aggregate_by_sido)와 DataFrame 기반 집계 비교"""
+    data = make_synthetic_stations(n)
     
-    sorted_sidos = sorted(sido_stats.items(), key=lambda x: x[0])
+    def dict_path():
+        sido_stats = legacy_aggregate_by_sido(data)
+        totals = {column: sum(s[column] for s in sido_stats.values()) for column in STAT_COLUMNS}
+        top5 = sorted(sido_stats.items(), key=lambda x: x[1]['충전소수'], reverse=True)[:5]
+        return sido_stats, totals, top5
     
-    total_stations = 0
-    total_rapid = 0
-    total_slow = 0
-    total_all = 0
+    def frame_path():
+        city_stats = aggregate_frame(stations_to_frame(data))
+        sido_stats = metro_stats(city_stats)
+        totals = sido_stats.sum()
+        top5 = sido_stats.nlargest(5, '충전소수')
+        return sido_stats, totals, top5
     
-    for sido, stats in sorted_sidos:
-        print(f"{sido:<20} {stats['충전소수']:>10,}개 {stats['급속충전기']:>12,}대 "
-              f"{stats['완속충전기']:>12,}대 {stats['전체충전기']:>12,}대")
-        total_stations += stats['충전소수']
-        total_rapid += stats['급속충전기']
-        total_slow += stats['완속충전기']
-        total_all += stats['전체충전기']
+    expected = dict_path()[0]
+    actual = frame_path()[0]
+    assert {k: {c: int(v) for c, v in row.items()} for k, row in actual.to_dict('index').items()} == expected
     
-    print("-"*80)
-    print(f"{'합계':<20} {total_stations:>10,}개 {total_rapid:>12,}대 "
-          f"{total_slow:>12,}대 {total_all:>12,}대")
-    print("="*80)
-    
-    print("\n충전소 설치 상위 5개 시도:")
-    top5 = sorted(sido_stats.items(), key=lambda x: x[1]['충전소수'], reverse=True)[:5]
-    for i, (sido, stats) in enumerate(top5, 1):
-        print(f"  {i}. {sido}: {stats['충전소수']:,}개소 "
-              f"(급속 {stats['급속충전기']:,}대, 완속 {stats['완속충전기']:,}대)")
-
-def save_summary_csv(sido_stats, filename):
-    if not sido_stats:
-        print("저장할 데이터가 없습니다.")
-        return
-    
-    with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-        fieldnames = ['시도명', '충전소수', '급속충전기', '완속충전기', '전체충전기']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        
-        sorted_sidos = sorted(sido_stats.items(), key=lambda x: x[0])
-        
-        for sido, stats in sorted_sidos:
-            writer.writerow({
-                '시도명': sido,
-                '충전소수': stats['충전소수'],
-                '급속충전기': stats['급속충전기'],
-                '완속충전기': stats['완속충전기'],
-                '전체충전기': stats['전체충전기']
-            })
-        
-        total_stations = sum(s['충전소수'] for s in sido_stats.values())
-        total_rapid = sum(s['급속충전기'] for s in sido_stats.values())
-        total_slow = sum(s['완속충전기'] for s in sido_stats.values())
-        total_all = sum(s['전체충전기'] for s in sido_stats.values())
-        
-        writer.writerow({
-            '시도명': '합계',
-            '충전소수': total_stations,
-            '급속충전기': total_rapid,
-            '완속충전기': total_slow,
-            '전체충전기': total_all
-        })
-    
-    print(f"\nCSV 파일 저장 완료: {filename}")
-    print(f"   총 {len(sido_stats)}개 시도의 데이터 저장됨")
-
-def save_detail_csv(data, filename):
-    if not data:
-        print("저장할 데이터가 없습니다.")
-        return
-    
-    with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-        fieldnames = ['시도명', '시군구명', '건물명', '주소', '급속충전기', '완속충전기', '지원차종']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        
-        for item in data:
-            writer.writerow({
-                '시도명': item.get('metro', ''),
-                '시군구명': item.get('city', ''),
-                '건물명': item.get('stnPlace', ''),
-                '주소': item.get('stnAddr', ''),
-                '급속충전기': item.get('rapidCnt', 0),
-                '완속충전기': item.get('slowCnt', 0),
-                '지원차종': item.get('carType', '')
-            })
-    
-    print(f"상세 데이터 CSV 파일 저장 완료: {filename}")
-    print(f"   총 {len(data)}개의 충전소 데이터 저장됨")
+    print(f"\n집계 벤치마크: 충전소 {n:,}개, {repeat}회 중 최소 시간")
+    results = {}
+    for name, fn in (('dict 루프', dict_path), ('DataFrame', frame_path)):
+        results[name] = min(timeit.repeat(fn, number=1, repeat=repeat))
+        print(f"  {name:<10} {results[name]:.3f}초")
+    print(f"  속도 향상: {results['dict 루프'] / results['DataFrame']:.1f}배 (DataFrame 쪽은 시군구 집계 포함)")
 
 def main():
     api_key = os.getenv("KEPCO_API_KEY")
@@ -205,27 +311,39 @@ def main():
     print("전기차 충전소 데이터 크롤링 시작")
     print("="*80)
     
-    all_data = fetch_all_stations(api_key)
+    summary_filename = "ev_charging_stations_by_sido.csv"
+    detail_filename = "ev_charging_stations_detail.csv"
+    
+    city_filename = "ev_charging_stations_by_city.csv"
     
-    if not all_data:
+    city_stats, total_count = fetch_and_aggregate_stations(api_key, detail_filename)
+    
+    if not total_count:
         print("\n수집된 데이터가 없습니다.")
         return
     
-    print(f"\n총 {len(all_data)}개의 충전소 데이터를 수집했습니다.")
-
-    sido_stats = aggregate_by_sido(all_data)
+    print(f"\n총 {total_count}개의 충전소 데이터를 수집했습니다.")
     
+    sido_stats = metro_stats(city_stats)
     print_statistics(sido_stats)
+    print_statistics(city_stats, label='시군구명', unit='시군구', top_n=10, show_table=False)
     
-    summary_filename = "ev_charging_stations_by_sido.csv"
-    detail_filename = "ev_charging_stations_detail.csv"
-    
-    save_summary_csv(sido_stats, summary_filename)
-    save_detail_csv(all_data, detail_filename)
+    save_stats_csv(sido_stats, summary_filename)
+    save_stats_csv(city_stats, city_filename)
     
     print("\n모든 작업이 완료되었습니다!")
     print(f"   - 시도별 집계: {summary_filename}")
+    print(f"   - 시군구별 집계: {city_filename}")
     print(f"   - 상세 데이터: {detail_filename}")
+    print_fetch_report()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="전기차 충전소 데이터 수집")
+    parser.add_argument("--benchmark", action="store_true", help="집계 방식 마이크로 벤치마크 실행")
+    parser.add_argument("--rows", type=int, default=500_000, help="벤치마크용 충전소 수")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark_aggregation(args.rows)
+    else:
+        main()
@@ -1,10 +1,16 @@
-import urllib.request
+import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib
 from matplotlib import font_manager, rc
 
+from fetcher import fetch_text, print_fetch_report
+from ratelimit import sleep_backoff
+from response_cache import FOREVER
+
 serviceKey = "9c1Tfa3WhfHGPEcwJWTztA5wK6suu%2BbNKuBt%2B9Vl6DVPFePl6qkL7EeZ1u1YVqsBGeRvfsf85yHjawzhah06TA%3D%3D"
 
 def main():
@@ -18,7 +24,7 @@ def main():
     nEndYear = int(input("데이터를 몇 년까지 수집할까요: "))
     ed_cd = 'E'
 
-    jsonResult, result, natName, dataEnd = getTourismStatsService(nat_cd, ed_cd, nStartYear, nEndYear)
+    jsonResult, result, natName, dataEnd = getTourismStatsServiceParallel(nat_cd, ed_cd, nStartYear, nEndYear)
     if(natName==""):
         print("해당 국가의 데이터가 없습니다.")
     else:
@@ -49,20 +55,13 @@ def main():
     plt.grid(True)
     plt.show()
 
-def getRequestUrl(url):
-    req = urllib.request.Request(url)
-    try:
-        response = urllib.request.urlopen(req)
-        if response.getcode() == 200:
-            print("Successful request")
-            return response.read().decode('utf-8')
-        else:
-            print("Failed request")
-            return None
-    except Exception as e:
-        print(e)
+def getRequestUrl(url, cache_ttl=None, cache_if=None):
+    responseDecode = fetch_text(url, cache_ttl=cache_ttl, cache_if=cache_if)
+    if responseDecode is None:
         print("Failed request")
         return None
+    print("Successful request")
+    return responseDecode
 
 def getTourismStatsItem(yyyymm, nat_cd, ed_cd):
     service_url = "http://openapi.tour.go.kr/openapi/service/EdrcntTourismStatsService/getEdrcntTourismStatsList"
@@ -74,7 +73,9 @@ def getTourismStatsItem(yyyymm, nat_cd, ed_cd):
     url = service_url + parameters
     print(url)
     
-    responseDecode = getRequestUrl(url)
+    # 지난 달 통계는 다시 바뀌지 않으므로 만료 없이 캐시 (아직 집계 안 된 빈 달과 오류 응답은 저장하지 않음)
+    cache_ttl = FOREVER if yyyymm < datetime.now().strftime("%Y%m") else None
+    responseDecode = getRequestUrl(url, cache_ttl=cache_ttl, cache_if=hasTourismItems)
     
     if(responseDecode == None):
         return None
@@ -82,7 +83,12 @@ def getTourismStatsItem(yyyymm, nat_cd, ed_cd):
         return json.loads(responseDecode)
     
 
-def getTourismStatsService(nat_cd, ed_cd, nStartYear, nEndYear):
+def hasTourismItems(response):
+    body = response.json()["response"]
+    return body["header"]["resultMsg"] == "OK" and body["body"]["items"] != ""
+
+
+def getTourismStatsService(nat_cd, ed_cd, nStartYear, nEndYear, verbose=False):
     jsonResult = []
     result = []
     natName = ""
@@ -114,12 +120,176 @@ def getTourismStatsService(nat_cd, ed_cd, nStartYear, nEndYear):
                 print('-' * 70)
                 jsonResult.append({"nat_name":natName, "nat_cd":nat_cd, "yyyymm":yyyymm, "visit_cnt":num})
                 result.append([nat_cd, natName, yyyymm, num])
-                print("<마지막 jsonData>\n", json.dumps(jsonData, ensure_ascii=False, indent=4, sort_keys=True))
+                if verbose:
+                    print("<마지막 jsonData>\n", json.dumps(jsonData, ensure_ascii=False, indent=4, sort_keys=True))
             else:
                 print(f"API 오류: {jsonData['response']['header']['resultMsg']}")
                 break
     return (jsonResult, result, natName, dataEnd)
 
 
+def getTourismStatsMonth(yyyymm, nat_cd, ed_cd):
+    """
+    한 달치 조회 결과를 (상태, item)으로 정리.
+    상태는 'ok'(데이터 있음), 'empty'(아직 집계 안 된 달), 'fail'(요청/API 오류)
+    """
+    jsonData = getTourismStatsItem(yyyymm, nat_cd, ed_cd)
+    if jsonData is None:
+        return ('fail', None)
+    if jsonData["response"]["header"]["resultMsg"] != "OK":
+        print(f"API 오류: {jsonData['response']['header']['resultMsg']}")
+        return ('fail', None)
+    if jsonData["response"]["body"]["items"] == "":
+        return ('empty', None)
+    return ('ok', jsonData["response"]["body"]["items"]["item"])
+
+
+PROBE_RETRIES = 3
+
+
+def findDataEndIndex(months, nat_cd, ed_cd, cache):
+    """
+    데이터가 있는 마지막 달의 인덱스를 이진 탐색으로 찾는다. (하나도 없으면 -1)
+    조회한 달은 cache에 남겨서 본 수집 때 다시 요청하지 않는다.
+    탐색 중 한 달이 PROBE_RETRIES번 모두 실패하면 끝을 알 수 없으므로 None을 돌려준다.
+    실패한 달은 cache에 넣지 않는다 (본 수집 때 다시 요청).
+    """
+    def lookup(idx):
+        yyyymm = months[idx]
+        if yyyymm not in cache:
+            for attempt in range(PROBE_RETRIES):
+                status, item = getTourismStatsMonth(yyyymm, nat_cd, ed_cd)
+                if status != 'fail':
+                    cache[yyyymm] = (status, item)
+                    break
+                if attempt < PROBE_RETRIES - 1:
+                    sleep_backoff(attempt)
+            else:
+                return 'fail'
+        return cache[yyyymm][0]
+
+    # 과거 구간만 조회하는 경우가 대부분이라 마지막 달부터 확인
+    status = lookup(len(months) - 1)
+    if status == 'fail':
+        return None
+    if status == 'ok':
+        return len(months) - 1
+
+    lo, hi = 0, len(months) - 2
+    last = -1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        status = lookup(mid)
+        if status == 'fail':
+            return None
+        if status == 'empty':
+            hi = mid - 1
+        else:
+            last = mid
+            lo = mid + 1
+    return last
+
+
+def getTourismStatsServiceParallel(nat_cd, ed_cd, nStartYear, nEndYear, workers=8):
+    """
+    getTourismStatsService의 병렬 버전.
+    데이터 끝 달을 이진 탐색으로 찾고, 그 이전 달들은 스레드 풀로 한꺼번에 요청한 뒤
+    월 순서대로 결과를 정리한다. 반환 형식은 getTourismStatsService와 같다.
+    """
+    jsonResult = []
+    result = []
+    natName = ""
+    months = [f"{year}{month:02d}" for year in range(nStartYear, nEndYear + 1) for month in range(1, 13)]
+
+    cache = {}
+    endIdx = findDataEndIndex(months, nat_cd, ed_cd, cache)
+    if endIdx is None:
+        print("데이터 끝 달을 찾지 못해 전체 구간을 요청합니다.")
+        endIdx = len(months) - 1
+    elif endIdx < len(months) - 1:
+        print(f"데이터 없음.... (마지막 데이터: {months[endIdx] if endIdx >= 0 else '없음'})")
+
+    todo = [yyyymm for yyyymm in months[:endIdx + 1] if yyyymm not in cache]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for yyyymm, month_result in zip(todo, executor.map(lambda m: getTourismStatsMonth(m, nat_cd, ed_cd), todo)):
+            cache[yyyymm] = month_result
+
+    dataEnd = f"{nEndYear}12"
+    for yyyymm in months[:endIdx + 1]:
+        status, item = cache[yyyymm]
+        if status == 'fail':
+            print(f"API 요청 실패: {yyyymm}")
+            continue
+        if status == 'empty':
+            continue
+        dataEnd = yyyymm
+        natName = item["natKorNm"].replace(" ", "")
+        num = item["num"]
+        print('[ %s_%s: %s]' % (natName, yyyymm, num))
+        jsonResult.append({"nat_name":natName, "nat_cd":nat_cd, "yyyymm":yyyymm, "visit_cnt":num})
+        result.append([nat_cd, natName, yyyymm, num])
+
+    return (jsonResult, result, natName, dataEnd)
+
+
+def collectTourismStatsBatch(nat_cds, ed_cd, nStartYear, nEndYear, workers=16):
+    """
+    여러 국가의 (국가, 월) 요청을 하나의 스레드 풀로 함께 처리한다 (속도는 fetcher의 호스트별 토큰 버킷이 맞춘다).
+    반환값은 국가코드/연월 순으로 정렬된 long format 행 목록.
+    """
+    months = [f"{year}{month:02d}" for year in range(nStartYear, nEndYear + 1) for month in range(1, 13)]
+    jobs = [(nat_cd, yyyymm) for nat_cd in nat_cds for yyyymm in months]
+    def run(job):
+        nat_cd, yyyymm = job
+        return getTourismStatsMonth(yyyymm, nat_cd, ed_cd)
+
+    rows = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for (nat_cd, yyyymm), (status, item) in zip(jobs, executor.map(run, jobs)):
+            if status == 'fail':
+                print(f"API 요청 실패: {nat_cd} {yyyymm}")
+            elif status == 'ok':
+                rows.append({
+                    "nat_cd": nat_cd,
+                    "nat_name": item["natKorNm"].replace(" ", ""),
+                    "ed_cd": ed_cd,
+                    "yyyymm": yyyymm,
+                    "visit_cnt": item["num"],
+                })
+    return rows
+
+
+def batchMain(nat_cds, nStartYear, nEndYear, ed_cd='E'):
+    """입력 없이 여러 국가를 한 번에 수집해서 하나의 long format 파일로 저장"""
+    print("=== 출입국관광통계 일괄 수집: %d개 국가, %d~%d ===" % (len(nat_cds), nStartYear, nEndYear))
+    rows = collectTourismStatsBatch(nat_cds, ed_cd, nStartYear, nEndYear)
+    if not rows:
+        print("수집된 데이터가 없습니다.")
+        return
+
+    result_df = pd.DataFrame(rows, columns=["nat_cd", "nat_name", "ed_cd", "yyyymm", "visit_cnt"])
+    filename = "./tourism_stats_%s_%d_%d" % (ed_cd, nStartYear, nEndYear)
+    try:
+        result_df.to_parquet(filename + ".parquet", index=False)
+        print("저장 완료: %s.parquet (%d행)" % (filename, len(result_df)))
+    except ImportError:
+        # pyarrow/fastparquet이 없으면 CSV로 저장
+        result_df.to_csv(filename + ".csv", index=False, encoding='utf-8-sig')
+        print("저장 완료: %s.csv (%d행)" % (filename, len(result_df)))
+
+
 if __name__ == "__main__":
-    main()    
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="출입국관광통계 수집")
+    parser.add_argument("--nat-cd", nargs="+", help="일괄 수집할 국가코드 목록 (없으면 대화형 실행)")
+    parser.add_argument("--start", type=int, help="시작 연도")
+    parser.add_argument("--end", type=int, help="종료 연도")
+    parser.add_argument("--ed-cd", default="E", help="E: 입국, D: 출국")
+    args = parser.parse_args()
+
+    if args.nat_cd:
+        if args.start is None or args.end is None:
+            parser.error("--nat-cd 사용 시 --start, --end가 필요합니다.")
+        batchMain(args.nat_cd, args.start, args.end, args.ed_cd)
+    else:
+        main()
+    print_fetch_report()    
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+크롤링 예제 공용 HTTP 요청 모듈.
+
+모든 스크립트가 하나의 requests.Session을 공유해서
+호스트별 keep-alive 커넥션 풀을 재사용하고, gzip 압축 응답을 받는다.
+타임아웃/재시도 설정은 이 파일의 상수만 바꾸면 된다.
+GET 응답은 response_cache의 디스크 캐시를 거친다 (TTL/조건부 요청/LRU는 그 모듈 참고).
+네트워크로 나가는 요청은 모두 ratelimit의 호스트별 토큰 버킷과 재시도 정책을 거친다.
+"""
+import json
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import ratelimit
+import response_cache
+
+DEFAULT_TIMEOUT = 30          # 초
+MAX_RETRIES = 3               # 대기 시간은 ratelimit.backoff_delay / Retry-After
+RETRY_STATUS = (429, 500, 502, 503, 504)
+POOL_CONNECTIONS = 16         # 커넥션 풀을 유지할 호스트 수
+POOL_MAXSIZE = 16             # 호스트당 유지할 커넥션 수
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _create_session():
+    # 재시도는 urllib3가 아니라 send()에서 한다 (대기 시간을 속도 제한과 함께 관리하려고)
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=0,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return session
+
+
+def get_session():
+    """프로세스 전체에서 공유하는 Session (스레드 안전하게 한 번만 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def send(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, verify=True):
+    """
+    호스트별 토큰 버킷을 거쳐 GET을 보낸다.
+    429/5xx와 연결 오류·타임아웃은 MAX_RETRIES번까지 재시도한다 (Retry-After가 있으면 그만큼, 없으면 지수 백오프).
+    429면 그 호스트 전체 속도도 낮춘다.
+    """
+    bucket = ratelimit.bucket_for(url)
+    for attempt in range(MAX_RETRIES + 1):
+        bucket.acquire()
+        started = time.perf_counter()
+        try:
+            response = get_session().get(url, params=params, headers=headers, timeout=timeout, verify=verify)
+        except (requests.ConnectionError, requests.Timeout):
+            ratelimit.record("fetching", time.perf_counter() - started)
+            ratelimit.record("requests")
+            if attempt == MAX_RETRIES:
+                ratelimit.record("failures")
+                raise
+            ratelimit.record("retries")
+            ratelimit.sleep_backoff(attempt)
+            continue
+
+        ratelimit.record("fetching", time.perf_counter() - started)
+        ratelimit.record("requests")
+        if response.status_code not in RETRY_STATUS:
+            bucket.recover()
+            return response
+        if attempt == MAX_RETRIES:
+            ratelimit.record("failures")
+            return response
+
+        ratelimit.record("retries")
+        retry_after = ratelimit.retry_after_seconds(response)
+        if response.status_code == 429:
+            # 다음 acquire()에서 이 호스트를 쓰는 모든 스레드가 함께 기다린다
+            bucket.penalize(retry_after if retry_after is not None else ratelimit.backoff_delay(attempt))
+        else:
+            ratelimit.sleep_backoff(attempt, retry_after)
+
+
+def is_cacheable(response, cache_if=None):
+    """200이고, cache_if가 있으면 그것도 통과한 응답만 저장 (200인데 본문이 API 오류인 경우 거르기)"""
+    if response.status_code != 200:
+        return False
+    if cache_if is None:
+        return True
+    try:
+        return bool(cache_if(response))
+    except (ValueError, KeyError, TypeError):
+        return False
+
+
+def fetch(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, verify=True, cache_ttl=None, cache_if=None):
+    """
+    공유 세션으로 GET 요청을 보내고 Response를 그대로 돌려준다.
+    네트워크 오류는 requests.RequestException으로 올라간다.
+
+    cache_ttl: None이면 response_cache.ENDPOINT_TTLS 기준, 0이면 캐시 안 씀,
+               response_cache.FOREVER면 만료 없음 (다시 바뀌지 않는 과거 데이터)
+    cache_if(response): True를 돌려준 응답만 캐시에 저장
+    """
+    ttl = response_cache.endpoint_ttl(url) if cache_ttl is None else cache_ttl
+    if not response_cache.ENABLED or ttl <= 0:
+        return send(url, params=params, headers=headers, timeout=timeout, verify=verify)
+
+    cache = response_cache.get_cache()
+    key = response_cache.cache_key(url, params, headers)
+    cached = cache.get(key, url)
+    request_headers = dict(headers or {})
+    if cached is not None:
+        cached_response, fresh = cached
+        if fresh:
+            response_cache.count("hit")
+            return cached_response
+        if "ETag" in cached_response.headers:
+            request_headers["If-None-Match"] = cached_response.headers["ETag"]
+        if "Last-Modified" in cached_response.headers:
+            request_headers["If-Modified-Since"] = cached_response.headers["Last-Modified"]
+
+    response = send(url, params=params, headers=request_headers, timeout=timeout, verify=verify)
+    if cached is not None and response.status_code == 304:
+        cache.touch(key)
+        response_cache.count("revalidated")
+        return cached_response
+
+    response_cache.count("miss")
+    if is_cacheable(response, cache_if):
+        cache.put(key, response, ttl)
+    return response
+
+
+def fetch_text(url, params=None, headers=None, enc='utf-8', timeout=DEFAULT_TIMEOUT, verify=True,
+               cache_ttl=None, cache_if=None):
+    """성공(200)하면 디코딩된 본문, 실패하면 에러를 출력하고 None"""
+    try:
+        response = fetch(url, params=params, headers=headers, timeout=timeout, verify=verify,
+                         cache_ttl=cache_ttl, cache_if=cache_if)
+    except requests.RequestException as e:
+        print(e)
+        print("Failed request: %s" % url)
+        return None
+
+    if response.status_code != 200:
+        print("HTTP %s for URL : %s" % (response.status_code, url))
+        return None
+
+    try:
+        return response.content.decode(enc)
+    except UnicodeDecodeError:
+        return response.content.decode(enc, 'replace')
+
+
+def fetch_json(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, verify=True, cache_ttl=None, cache_if=None):
+    """성공(200)하면 JSON 객체, 실패하면 None"""
+    text = fetch_text(url, params=params, headers=headers, timeout=timeout, verify=verify,
+                      cache_ttl=cache_ttl, cache_if=cache_if)
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        print(f"JSON 파싱 오류: {e}")
+        return None
+
+
+def print_fetch_report():
+    """실행 끝에 캐시 적중과 요청/대기 시간 출력"""
+    response_cache.print_cache_stats()
+    ratelimit.print_timing_stats()
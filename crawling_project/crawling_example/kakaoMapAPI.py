@@ -1,10 +1,11 @@
 import os
-import requests
 import pandas as pd
 import folium
 import webbrowser
 from dotenv import load_dotenv
 
+from fetcher import fetch
+
 load_dotenv()
 API_KEY = os.getenv("KAKAO_API_KEY")
 
@@ -18,7 +19,7 @@ def search_places(keyword, page=1, size=15):
         "page": page,
         "size": size
     }
-    response = requests.get(url, headers=headers, params=params)
+    response = fetch(url, headers=headers, params=params)
     response.raise_for_status()
     return response.json()
 
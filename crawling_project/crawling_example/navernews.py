@@ -1,13 +1,14 @@
-import urllib
-import urllib.request
 import urllib.parse
 import os
 import pandas as pd
 import time
+import asyncio
 import json
 import datetime
 from dotenv import load_dotenv
 
+from fetcher import fetch_text, print_fetch_report
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -15,20 +16,20 @@ load_dotenv()
 client_id = os.environ.get("NAVER_CLIENT_ID")
 client_secret = os.environ.get("NAVER_CLIENT_SECRET")
 
+NAVER_MAX_START = 1000    # 검색 API start 파라미터 최대값
+NAVER_MAX_DISPLAY = 100   # 한 번에 가져올 수 있는 최대 건수
+
 def getRequestUrl(url):
-    request = urllib.request.Request(url)
-    request.add_header('X-Naver-Client-Id', client_id)
-    request.add_header('X-Naver-Client-Secret', client_secret)
-
-    try:
-        response = urllib.request.urlopen(request)
-        if response.getcode() == 200:
-            print("Successful request")
-            return response.read().decode('utf-8')
-    except Exception as e:
-        print(e)
+    headers = {
+        'X-Naver-Client-Id': client_id,
+        'X-Naver-Client-Secret': client_secret,
+    }
+    responseDecode = fetch_text(url, headers=headers)
+    if responseDecode is None:
         print("Failed request")
         return None
+    print("Successful request")
+    return responseDecode
 
 def getNaverSearch(node, srcText, start, display):
     base = "https://openapi.naver.com/v1/search"
@@ -55,37 +56,86 @@ def getPostData(post, jsonResult, cnt):
     jsonResult.append({'cnt':cnt, 'title':title, 'description':description, 'org_link':org_link, 'link':link, 'pDate':pDate})
     return
 
-def main():
-    if not client_id or not client_secret:
-        print("에러: NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET를 .env 파일에 설정해주세요.")
-        return
-    
-    print("=== Naver 뉴스 검색 ===")
-    node = 'news'
-    srcText = input("검색할 키워드를 입력하세요: ")
+def collectNaverSearch(node, srcText, display=NAVER_MAX_DISPLAY):
+    """이전 응답의 start/display로 다음 페이지를 하나씩 요청하는 직렬 수집"""
     cnt = 0
     jsonResult = []
 
-    jsonResponse = getNaverSearch(node, srcText, 1, 100)
-    
+    jsonResponse = getNaverSearch(node, srcText, 1, display)
     if jsonResponse is None:
-        print("API 요청에 실패했습니다.")
-        return
-    
+        return None
+
     total = jsonResponse['total']
-    
+
     while ((jsonResponse != None) and (jsonResponse['display'] != 0)):
         for post in jsonResponse['items']:
             cnt += 1
             getPostData(post, jsonResult, cnt)
-        
+
         start = jsonResponse['start'] + jsonResponse['display']
-        jsonResponse = getNaverSearch(node, srcText, start, 100)
-        
+        jsonResponse = getNaverSearch(node, srcText, start, display)
+
         if cnt >= total:
             break
+
+    return jsonResult
+
+async def collectNaverSearchAsync(node, srcText, display=NAVER_MAX_DISPLAY,
+                                  max_concurrency=5):
+    """
+    1페이지 응답의 total로 나머지 start 구간을 모두 계산한 뒤 한꺼번에 요청한다.
+    결과는 start 순서대로 합쳐서 cnt가 직렬 수집과 같은 번호를 갖도록 한다.
+    직렬 수집처럼 실패한 구간을 만나면 거기서 멈추고, 그 뒤 구간은 버린 것으로 알린다.
+    요청 속도는 fetcher의 호스트별 토큰 버킷이 맞춘다.
+    """
+    first = await asyncio.to_thread(getNaverSearch, node, srcText, 1, display)
+    if first is None:
+        return None
+
+    last = min(first['total'], NAVER_MAX_START)
+    starts = list(range(1 + display, last + 1, display))
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetchWindow(start):
+        async with semaphore:
+            return await asyncio.to_thread(getNaverSearch, node, srcText, start, display)
+
+    pages = [first] + list(await asyncio.gather(*(fetchWindow(start) for start in starts)))
+
+    cnt = 0
+    jsonResult = []
+    for i, page in enumerate(pages):
+        if page is None:
+            skipped = len(pages) - i
+            print(f"start={1 + i * display} 요청 실패: 이후 {skipped}개 구간은 수집하지 않습니다.")
+            break
+        for post in page['items']:
+            cnt += 1
+            getPostData(post, jsonResult, cnt)
+
+    return jsonResult
+
+def main(use_async=True):
+    if not client_id or not client_secret:
+        print("에러: NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET를 .env 파일에 설정해주세요.")
+        return
+    
+    print("=== Naver 뉴스 검색 ===")
+    node = 'news'
+    srcText = input("검색할 키워드를 입력하세요: ")
+
+    started = time.perf_counter()
+    if use_async:
+        jsonResult = asyncio.run(collectNaverSearchAsync(node, srcText))
+    else:
+        jsonResult = collectNaverSearch(node, srcText)
+    
+    if jsonResult is None:
+        print("API 요청에 실패했습니다.")
+        return
     
-    print(f"총 {cnt}개의 뉴스를 수집했습니다.")
+    print(f"총 {len(jsonResult)}개의 뉴스를 수집했습니다. ({time.perf_counter() - started:.2f}초)")
     
     # JSON 파일 저장
     with open('./naver_news.json', 'w', encoding='utf-8') as outfile:
@@ -97,6 +147,7 @@ def main():
     df.to_csv('./naver_news.csv', index=False, encoding='utf-8-sig')
     
     print("naver_news.json과 naver_news.csv 파일로 저장되었습니다.")
+    print_fetch_report()
 
 if __name__ == "__main__":
     main()
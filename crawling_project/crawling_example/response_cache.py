@@ -0,0 +1,188 @@
+"""
+API 응답 디스크 캐시 (SQLite 파일 하나).
+
+- key: 정규화한 요청(호스트 소문자, 쿼리 파라미터 정렬)에서 인증키를 뺀 것의 sha256.
+  인증키는 key에도, 저장되는 내용에도 남지 않는다.
+- TTL 안이면 네트워크 없이 저장된 응답을 쓰고, 지났으면 ETag/Last-Modified로 조건부 요청을 보낸다.
+- 전체 크기가 MAX_CACHE_BYTES를 넘으면 가장 오래 안 쓴 응답부터 지운다 (LRU).
+
+TTL은 ENDPOINT_TTLS에서 호스트/경로로 정하고, 다시 바뀌지 않는 과거 기간
+(지난 달 관광 통계, 지난 해 사고 다발지 등)은 호출하는 쪽에서 FOREVER로 넘긴다.
+HTTP_CACHE=0 환경 변수로 끌 수 있다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache.sqlite3")
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+ENABLED = os.environ.get("HTTP_CACHE", "1") != "0"
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+FOREVER = float("inf")
+
+# (호스트, 경로 접두사, TTL 초) - 위에서부터 처음 맞는 것 사용
+ENDPOINT_TTLS = [
+    ("openapi.naver.com", "/v1/search", HOUR),
+    ("openapi.tour.go.kr", "/", DAY),
+    ("openapi.seoul.go.kr", "/", DAY),
+    ("opendata.koroad.or.kr", "/", DAY),
+    ("bigdata.kepco.co.kr", "/", DAY),
+    ("dapi.kakao.com", "/", 7 * DAY),
+    ("www.cheogajip.co.kr", "/", DAY),
+]
+DEFAULT_TTL = 0  # 목록에 없는 곳은 캐시하지 않음
+
+# key를 만들 때 빼는 인증 정보 (소문자로 비교)
+SECRET_PARAMS = {"servicekey", "apikey", "authkey", "key", "client_id", "client_secret", "access_token"}
+SECRET_HEADERS = {"x-naver-client-id", "x-naver-client-secret", "authorization"}
+SECRET_PATH_SEGMENT = {"openapi.seoul.go.kr": 0}  # 경로 N번째 칸이 인증키인 API
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+cache_stats = {"hit": 0, "revalidated": 0, "miss": 0}
+_stats_lock = threading.Lock()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def count(kind):
+    """cache_stats[kind] += 1 (여러 스레드가 같이 부른다)"""
+    with _stats_lock:
+        cache_stats[kind] += 1
+
+
+def endpoint_ttl(url):
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    for ttl_host, prefix, ttl in ENDPOINT_TTLS:
+        if host == ttl_host and parts.path.startswith(prefix):
+            return ttl
+    return DEFAULT_TTL
+
+
+def cache_key(url, params=None, headers=None):
+    """URL 쿼리와 params를 합쳐 정렬하고 인증 정보를 뺀 요청의 해시"""
+    parts = urlsplit(requests.Request("GET", url, params=params).prepare().url)
+    host = (parts.hostname or "").lower()
+    netloc = host if parts.port is None else f"{host}:{parts.port}"
+
+    segments = parts.path.split("/")
+    if host in SECRET_PATH_SEGMENT:
+        index = SECRET_PATH_SEGMENT[host] + 1  # split 결과 맨 앞은 빈 문자열
+        if index < len(segments):
+            segments[index] = "*"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in SECRET_PARAMS
+    )
+    normalized = urlunsplit((parts.scheme.lower(), netloc, "/".join(segments), urlencode(query), ""))
+    kept_headers = sorted(
+        (k.lower(), v) for k, v in (headers or {}).items() if k.lower() not in SECRET_HEADERS
+    )
+    raw = json.dumps([normalized, kept_headers], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def build_response(url, status, headers, body):
+    """저장된 내용으로 requests.Response를 만든다 (호출하는 쪽은 네트워크 응답과 똑같이 쓰면 된다)"""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "OK"
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+class ResponseCache:
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key       TEXT PRIMARY KEY,
+                status    INTEGER NOT NULL,
+                headers   TEXT NOT NULL,
+                body      BLOB NOT NULL,
+                size      INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                ttl       REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+        self.conn.commit()
+
+    def get(self, key, url):
+        """(Response, TTL 안인지 여부). 없으면 None"""
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT status, headers, body, stored_at, ttl FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+
+        status, headers, body, stored_at, ttl = row
+        return build_response(url, status, json.loads(headers), body), now - stored_at < ttl
+
+    def put(self, key, response, ttl):
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        body = response.content
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.status_code, json.dumps(headers), body, len(body), now, ttl, now),
+            )
+            self._evict()
+
+    def touch(self, key):
+        """304 Not Modified를 받았을 때: 저장된 응답을 다시 TTL 동안 신선한 것으로"""
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE responses SET stored_at = ?, last_used = ? WHERE key = ?", (now, now, key))
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        self.conn.close()
+
+
+def get_cache():
+    """프로세스 전체에서 공유하는 ResponseCache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def print_cache_stats():
+    print(f"응답 캐시: 적중 {cache_stats['hit']}건, 재검증(304) {cache_stats['revalidated']}건, "
+          f"네트워크 {cache_stats['miss']}건")
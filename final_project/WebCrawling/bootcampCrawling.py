@@ -1,47 +1,16 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
 import pandas as pd
-import time
-
-
-def init_driver(headless=True):
-    chrome_options = Options()
-    if headless:
-        chrome_options.add_argument("--headless=new")
-
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-software-rasterizer")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-logging")
-    chrome_options.add_argument("--log-level=3")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--ignore-certificate-errors")
-    chrome_options.add_argument("--ignore-ssl-errors")
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    )
-    chrome_options.page_load_strategy = "normal"
-    chrome_options.add_experimental_option(
-        "excludeSwitches", ["enable-logging", "enable-automation"]
-    )
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.set_page_load_timeout(60)
-    driver.implicitly_wait(10)
-    return driver
+
+from driver_pool import create_driver
+from ratelimit import bucket_for
+from seen_store import append_new_rows
+
+
+def init_driver(headless=True, lean=True):
+    return create_driver(headless=headless, page_load_timeout=60, implicit_wait=10, lean=lean)
 
 
 def extract_title_and_org_from_first_cell(cell_text: str):
@@ -66,134 +35,204 @@ def extract_title_and_org_from_first_cell(cell_text: str):
     return title, org_name
 
 
-def extract_category_from_row(row):
-    try:
-        cells = row.find_elements(By.TAG_NAME, "td")
-        if cells:
-            first_td = cells[0].text.strip()
-            category = first_td.split('\n')[0].strip()
-            if category in ["데이터분석", "데이터사이언스", "AI/ML", "AI서비스"]:
-                return category
-    except Exception:
-        pass
+CATEGORIES = ["데이터분석", "데이터사이언스", "AI/ML", "AI서비스"]
+KEYWORD_SKIP_WORDS = ["선발", "절차", "코딩", "없음", "있음"]
+
+# 화면에 렌더링된 모든 행의 data-index, th, td 텍스트를 한 번의 호출로 가져온다
+EXTRACT_ROWS_JS = """
+return Array.from(document.querySelectorAll('tr[data-index]')).map(row => {
+    const th = row.querySelector('th');
+    return {
+        index: row.getAttribute('data-index'),
+        th: th ? th.innerText : null,
+        tds: Array.from(row.querySelectorAll('td')).map(td => td.innerText),
+    };
+});
+"""
+
+
+def parse_category(td_texts):
+    if td_texts:
+        category = td_texts[0].strip().split('\n')[0].strip()
+        if category in CATEGORIES:
+            return category
     return None
 
 
-def extract_keywords_from_row(row):
+def parse_keywords(td_texts):
     """
     선발절차·키워드 컬럼에서 기술 키워드만 추출.
     "선발 절차" 관련 텍스트는 제외.
     """
-    try:
-        cells = row.find_elements(By.TAG_NAME, "td")
-        
-        if len(cells) > 6:
-            keyword_cell = cells[6]
-            keywords = []
-            
-            full_text = keyword_cell.text.strip()
-            if full_text:
-                lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-                
-                for line in lines:
-                    skip_keywords = ["선발", "절차", "코딩", "없음", "있음"]
-                    if any(skip in line for skip in skip_keywords):
-                        continue
-                    
-                    if len(line) >= 2:
-                        keywords.append(line)
-            
-            return keywords
-            
-    except Exception:
-        pass
-    
-    return []
+    if len(td_texts) <= 6:
+        return []
+
+    keywords = []
+    full_text = td_texts[6].strip()
+    if full_text:
+        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
+
+        for line in lines:
+            if any(skip in line for skip in KEYWORD_SKIP_WORDS):
+                continue
+
+            if len(line) >= 2:
+                keywords.append(line)
+
+    return keywords
+
+
+def build_row_data(th_text, td_texts):
+    """th/td 텍스트로 행 데이터 구성 (제목이 없으면 None)"""
+    title, org_name = extract_title_and_org_from_first_cell(th_text.strip())
+    if not title:
+        return None
+
+    category = parse_category(td_texts)
+    keywords = parse_keywords(td_texts)
+
+    return {
+        "organization": org_name if org_name else "",
+        "title": title,
+        "category": category if category else "",
+        "keywords": ", ".join(keywords) if keywords else "",
+    }
 
 
 def extract_row_data(row):
-    """단일 행에서 데이터 추출 (키워드 포함)"""
+    """단일 행에서 데이터 추출 (키워드 포함). 셀마다 WebDriver 호출이 발생한다."""
     try:
         first_cell = row.find_element(By.TAG_NAME, "th")
-        first_cell_text = first_cell.text.strip()
-        
-        title, org_name = extract_title_and_org_from_first_cell(first_cell_text)
-        if not title:
-            return None
-        
-        category = extract_category_from_row(row)
-        keywords = extract_keywords_from_row(row)
-        
-        return {
-            "organization": org_name if org_name else "",
-            "title": title,
-            "category": category if category else "",
-            "keywords": ", ".join(keywords) if keywords else "",
-        }
+        cells = [cell.text for cell in row.find_elements(By.TAG_NAME, "td")]
+        return build_row_data(first_cell.text, cells)
     except Exception:
         return None
 
 
-def scroll_and_collect_data(driver, source_label, max_scrolls=300):
+def extract_visible_rows(driver):
     """
-    가상 스크롤 페이지에서 조금씩 스크롤하면서 데이터 수집.
+    보이는 행 전체를 execute_script 한 번으로 읽어서 파싱.
+    반환값: {data-index: 행 데이터}
+    """
+    rows = {}
+    for raw in driver.execute_script(EXTRACT_ROWS_JS) or []:
+        if raw.get("index") is None or not raw.get("th"):
+            continue
+        row_data = build_row_data(raw["th"], raw.get("tds") or [])
+        if row_data:
+            rows[raw["index"]] = row_data
+    return rows
+
+
+def collect_rows_per_element(driver, source_label, collected_data):
+    rows = driver.find_elements(By.CSS_SELECTOR, "tr[data-index]")
+
+    for row in rows:
+        try:
+            data_index = row.get_attribute("data-index")
+
+            if data_index in collected_data:
+                continue
+
+            row_data = extract_row_data(row)
+            if row_data:
+                row_data["source"] = source_label
+                collected_data[data_index] = row_data
+
+        except Exception:
+            continue
+
+
+SETTLE_TIMEOUT = 2.0  # 스크롤 한 번 뒤 새 행을 기다리는 기본 최대 시간(초)
+
+# 새 tr[data-index] 행이 렌더링될 때까지 MutationObserver로 기다렸다가 현재 최대 data-index를 돌려준다
+WAIT_FOR_NEW_ROWS_JS = """
+const [container, lastMax, timeoutMs, done] = arguments;
+const maxIndex = () => {
+    let m = -1;
+    document.querySelectorAll('tr[data-index]').forEach(row => {
+        const v = parseInt(row.getAttribute('data-index'), 10);
+        if (v > m) m = v;
+    });
+    return m;
+};
+if (maxIndex() > lastMax) { done(maxIndex()); return; }
+const timer = setTimeout(() => { observer.disconnect(); done(maxIndex()); }, timeoutMs);
+const observer = new MutationObserver(() => {
+    const m = maxIndex();
+    if (m > lastMax) { observer.disconnect(); clearTimeout(timer); done(m); }
+});
+observer.observe(container, {childList: true, subtree: true, attributes: true, attributeFilter: ['data-index']});
+"""
+
+
+def find_scroll_container(driver):
+    bootcamp_list = driver.find_element(By.ID, "default-bootcamp-list")
+
+    inner_divs = bootcamp_list.find_elements(By.CSS_SELECTOR, "div")
+    for div in inner_divs:
+        overflow_y = driver.execute_script(
+            "return window.getComputedStyle(arguments[0]).overflowY;", div
+        )
+        if overflow_y in ['auto', 'scroll']:
+            return div
+
+    return bootcamp_list
+
+
+def scroll_and_collect_data(driver, source_label, max_scrolls=300, settle_timeout=SETTLE_TIMEOUT,
+                            max_idle_steps=2, batched=True):
+    """
+    가상 스크롤 페이지에서 화면 높이만큼 스크롤하면서 데이터 수집.
+    고정 sleep 대신 새 행(tr[data-index])이 DOM에 추가될 때까지만 기다리고,
+    최대 data-index가 max_idle_steps번 연속으로 늘지 않으면 끝난 것으로 본다.
+    batched=True면 스크롤 한 번당 행 추출을 execute_script 한 번으로 처리한다.
+    settle_timeout: 스크롤 한 번 뒤 새 행을 기다리는 최대 시간(초). 느린 네트워크에서는 늘린다.
     """
     try:
-        bootcamp_list = driver.find_element(By.ID, "default-bootcamp-list")
-        
-        scrollable = None
-        inner_divs = bootcamp_list.find_elements(By.CSS_SELECTOR, "div")
-        for div in inner_divs:
-            overflow_y = driver.execute_script(
-                "return window.getComputedStyle(arguments[0]).overflowY;", div
-            )
-            if overflow_y in ['auto', 'scroll']:
-                scrollable = div
-                break
-        
-        if not scrollable:
-            scrollable = bootcamp_list
-        
+        scrollable = find_scroll_container(driver)
+        driver.set_script_timeout(settle_timeout + 5)
+
+        # 겹치는 행이 생기도록 화면 높이의 90%씩 이동
+        scroll_step = int(driver.execute_script(
+            "return arguments[0].clientHeight || window.innerHeight;", scrollable
+        ) * 0.9) or 500
+
         collected_data = {}
-        consecutive_no_new = 0
-        max_no_new = 30
-        scroll_step = 500
-        
-        for i in range(max_scrolls):
-            rows = driver.find_elements(By.CSS_SELECTOR, "tr[data-index]")
-            
-            new_count = 0
-            for row in rows:
-                try:
-                    data_index = row.get_attribute("data-index")
-                    
-                    if data_index in collected_data:
-                        continue
-                    
-                    row_data = extract_row_data(row)
-                    if row_data:
+        dom_max_index = -1
+        idle_steps = 0
+
+        def collect_visible():
+            if batched:
+                for data_index, row_data in extract_visible_rows(driver).items():
+                    if data_index not in collected_data:
                         row_data["source"] = source_label
                         collected_data[data_index] = row_data
-                        new_count += 1
-                        
-                except Exception:
-                    continue
-            
-                if new_count > 0:
-                consecutive_no_new = 0
             else:
-                consecutive_no_new += 1
-                if consecutive_no_new >= max_no_new:
-                    break
-            
-            current_scroll = driver.execute_script("return arguments[0].scrollTop;", scrollable)
+                collect_rows_per_element(driver, source_label, collected_data)
+
+        for i in range(max_scrolls):
+            collect_visible()
+
             driver.execute_script(
-                f"arguments[0].scrollTop = {current_scroll + scroll_step};", scrollable
+                "arguments[0].scrollTop = arguments[0].scrollTop + arguments[1];", scrollable, scroll_step
             )
-            time.sleep(1.2)
-        
+            new_max_index = driver.execute_async_script(
+                WAIT_FOR_NEW_ROWS_JS, scrollable, dom_max_index, int(settle_timeout * 1000)
+            )
+
+            if new_max_index > dom_max_index:
+                dom_max_index = new_max_index
+                idle_steps = 0
+            else:
+                idle_steps += 1
+                if idle_steps >= max_idle_steps:
+                    break
+
+        # 마지막 스크롤 뒤에 렌더링된 행 (max_scrolls를 다 쓴 경우 포함)
+        collect_visible()
         return list(collected_data.values())
-        
+
     except Exception as e:
         print(f"  에러 발생: {e}")
         return []
@@ -203,18 +242,20 @@ def crawl_boottent_single_page(
     driver,
     url: str,
     source_label: str = "current",
+    settle_timeout: float = SETTLE_TIMEOUT,
 ):
+    bucket_for(url).acquire()
     driver.get(url)
 
     try:
+        # 목록 컨테이너가 아니라 첫 행이 렌더링될 때까지 기다린다
         WebDriverWait(driver, 20).until(
             EC.presence_of_element_located(
-                (By.ID, "default-bootcamp-list")
+                (By.CSS_SELECTOR, "#default-bootcamp-list tr[data-index]")
             )
         )
-        time.sleep(3)
         
-        results = scroll_and_collect_data(driver, source_label)
+        results = scroll_and_collect_data(driver, source_label, settle_timeout=settle_timeout)
         return results
 
     except Exception:
@@ -224,7 +265,13 @@ def crawl_boottent_single_page(
 def crawl_boottent_data_category(
     output_csv: str = "./final_project/WebCrawling/bootcampCrawling.csv",
     headless: bool = True,
+    incremental: bool = False,
+    settle_timeout: float = SETTLE_TIMEOUT,
 ):
+    """
+    incremental=True면 기존 CSV에 없는 새 부트캠프(제목 기준)만 덧붙인다.
+    목록이 최신순 정렬이 아니라서 스크롤은 끝까지 하고, 저장할 때만 걸러낸다.
+    """
     BASE_URL = "https://boottent.com/camps?categories=data"
 
     driver = init_driver(headless=headless)
@@ -236,6 +283,7 @@ def crawl_boottent_data_category(
                 driver,
                 url=BASE_URL,
                 source_label="data_category",
+                settle_timeout=settle_timeout,
             )
         )
 
@@ -245,10 +293,15 @@ def crawl_boottent_data_category(
     if all_results:
         df = pd.DataFrame(all_results)
         df_unique = df.drop_duplicates(subset=["title"], keep="first")
-        df_unique.to_csv(output_csv, index=False, encoding="utf-8-sig")
+
+        if incremental:
+            added = append_new_rows(df_unique, output_csv, "title")
+            print(f"새 부트캠프 {added}개 추가")
+        else:
+            df_unique.to_csv(output_csv, index=False, encoding="utf-8-sig")
 
     return all_results
 
 
 if __name__ == "__main__":
-    crawl_boottent_data_category(headless=True)
+    crawl_boottent_data_category(headless=True, incremental=True)
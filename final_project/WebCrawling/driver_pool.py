@@ -0,0 +1,242 @@
+"""
+WebCrawling 스크립트 공용 Chrome WebDriver 생성/풀 모듈.
+
+- chromedriver 경로는 프로세스당 한 번만 찾고, 디스크에도 기록해 다음 실행에서 재사용한다.
+- DriverPool은 미리 띄워 둔 headless 브라우저 N개를 작업에 빌려주고,
+  작업 수(페이지) 한도를 넘기거나 브라우저가 죽으면 새 것으로 교체한다.
+"""
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+# lean 프로필에서 막을 요청: 이미지/미디어/폰트 + 분석·광고 트래커
+BLOCKED_URL_PATTERNS = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+    "*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*hotjar.com*", "*clarity.ms*",
+    "*amplitude.com*", "*mixpanel.com*", "*segment.io*", "*sentry.io*",
+    "*wcs.naver.net*", "*channel.io*", "*datadoghq*",
+]
+DRIVER_PATH_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chromedriver_path")
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path(refresh=False):
+    """
+    chromedriver 실행 파일 경로.
+    CHROMEDRIVER_PATH 환경 변수 > 디스크 캐시 > ChromeDriverManager().install() 순서로 찾는다.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and not refresh:
+            return _driver_path
+
+        path = os.environ.get("CHROMEDRIVER_PATH")
+        if not path and not refresh and os.path.exists(DRIVER_PATH_CACHE):
+            with open(DRIVER_PATH_CACHE, encoding="utf-8") as f:
+                path = f.read().strip()
+            if not os.path.exists(path):
+                path = None
+
+        if not path:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            with open(DRIVER_PATH_CACHE, "w", encoding="utf-8") as f:
+                f.write(path)
+
+        _driver_path = path
+        return _driver_path
+
+
+def build_options(headless=True, page_load_strategy="normal", lean=False, perf_log=False):
+    """lean=True면 이미지 로딩을 끈다. perf_log=True면 네트워크 로그(전송 바이트 측정용)를 켠다."""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-software-rasterizer")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-logging")
+    chrome_options.add_argument("--log-level=3")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--ignore-certificate-errors")
+    chrome_options.add_argument("--ignore-ssl-errors")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    chrome_options.page_load_strategy = page_load_strategy
+    chrome_options.add_experimental_option(
+        "excludeSwitches", ["enable-logging", "enable-automation"]
+    )
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    if lean:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+    if perf_log:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+
+def create_driver(headless=True, page_load_timeout=30, implicit_wait=0, page_load_strategy=None,
+                  lean=False, perf_log=False):
+    """
+    캐시된 chromedriver 경로로 Chrome 시작 (경로가 낡았으면 한 번 다시 찾는다).
+    lean=True면 eager 로드 + BLOCKED_URL_PATTERNS 차단. 필요한 요소는 호출하는 쪽에서 selector로 기다린다.
+    """
+    if page_load_strategy is None:
+        page_load_strategy = "eager" if lean else "normal"
+    options = build_options(headless=headless, page_load_strategy=page_load_strategy,
+                            lean=lean, perf_log=perf_log)
+    try:
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+    except WebDriverException:
+        driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=options)
+
+    try:
+        driver.set_page_load_timeout(page_load_timeout)
+        if lean:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        if implicit_wait:
+            driver.implicitly_wait(implicit_wait)
+    except Exception:
+        quit_driver(driver)  # 설정 중 실패하면 띄운 Chrome이 남지 않게
+        raise
+    return driver
+
+
+def is_alive(driver):
+    try:
+        process = driver.service.process
+        if process is not None and process.poll() is not None:
+            return False
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    """
+    headless 브라우저 풀.
+
+        with DriverPool(size=3) as pool:
+            with pool.driver() as driver:
+                driver.get(url)
+
+    한 번 빌려 가는 것을 작업 하나(페이지 하나)로 세고, max_pages번 쓰면 브라우저를 새로 띄운다.
+    작업 중 WebDriverException이 나거나 브라우저 프로세스가 죽어 있으면 바로 교체한다.
+    """
+
+    def __init__(self, size=2, max_pages=50, **driver_kwargs):
+        self.size = size
+        self.max_pages = max_pages
+        self.driver_kwargs = driver_kwargs
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(None)  # None 자리는 처음 빌려 갈 때 생성
+
+    def warm_up(self):
+        """
+        size개의 브라우저를 미리 병렬로 띄워 둔다.
+        일부가 실패해도 뜬 브라우저는 풀에 넣고 실패한 자리는 None으로 돌려놓은 뒤 첫 예외를 다시 던진다.
+        """
+        slots = [self._idle.get() for _ in range(self.size)]
+        error = None
+        try:
+            missing = [i for i, d in enumerate(slots) if d is None]
+            with ThreadPoolExecutor(max_workers=max(1, len(missing))) as executor:
+                futures = {i: executor.submit(self._new_driver) for i in missing}
+            for i, future in futures.items():
+                try:
+                    slots[i] = future.result()
+                except Exception as e:
+                    error = error or e
+        finally:
+            for driver in slots:
+                self._idle.put(driver)
+        if error is not None:
+            raise error
+        return self
+
+    def _new_driver(self):
+        driver = create_driver(**self.driver_kwargs)
+        self._uses[id(driver)] = 0
+        return driver
+
+    @contextmanager
+    def driver(self):
+        driver = self._idle.get()
+        ready = False
+        try:
+            if driver is None or not is_alive(driver):
+                if driver is not None:
+                    self._discard(driver)
+                    driver = None
+                driver = self._new_driver()
+            ready = True
+        finally:
+            if not ready:
+                self._idle.put(driver)  # 생성에 실패해도 자리는 (None으로) 돌려놓는다
+
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self._release(driver, broken)
+
+    def _release(self, driver, broken):
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        if self._closed or broken or self._uses[id(driver)] >= self.max_pages or not is_alive(driver):
+            self._discard(driver)
+            driver = None
+        self._idle.put(driver)
+
+    def _discard(self, driver):
+        self._uses.pop(id(driver), None)
+        quit_driver(driver)
+
+    def close(self):
+        self._closed = True
+        for _ in range(self.size):
+            driver = self._idle.get()
+            if driver is not None:
+                self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
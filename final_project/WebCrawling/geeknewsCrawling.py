@@ -1,42 +1,26 @@
-import re
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
-from collections import Counter
-from kiwipiepy import Kiwi
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+from driver_pool import DriverPool
+from page_fetch import load_page, print_fetch_stats
+from pagination import paginate
+from seen_store import SeenStore
+from text_analytics import count_terms, print_load_times, render_wordcloud
+from trend_store import print_trends, record_titles
 
 BASE = "https://news.hada.io"  # GeekNews 기본 도메인[web:19]
 
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+TITLE_SELECTOR = 'a[href*="topic?id="]'
 
-def get_titles(driver, page=1):
+def get_titles(pool, page=1):
     """
     GeekNews 특정 페이지에서 뉴스 제목 리스트를 가져오는 함수.
     예: https://news.hada.io/?page=2 형태.[web:19]
+    HTTP로 먼저 받아 보고, 제목 링크가 없을 때만 pool의 브라우저를 쓴다.
     """
     url = f"{BASE}/?page={page}"
-    driver.get(url)
-    time.sleep(1)  # 로딩 약간 기다리기 (필요시 조정)
-
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = load_page(url, TITLE_SELECTOR, pool)
     titles = []
 
     # 각 뉴스 상세 페이지 링크: /topic?id=xxxx 형태[web:27]
-    for a in soup.select('a[href*="topic?id="]'):
+    for a in soup.select(TITLE_SELECTOR):
         text = a.get_text(" ", strip=True)
         # 짧은 숫자(순번) 같은 것 제외, 어느 정도 길이 있는 텍스트만 사용
         if text and len(text) > 3:
@@ -44,64 +28,29 @@ def get_titles(driver, page=1):
 
     return titles
 
-def clean_kor(text):
-    # 한글/영문/숫자 + 공백만 허용
-    text = re.sub(r"[^가-힣A-Za-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
-kiwi = Kiwi()
-stopwords = set(["하다","되다","있다","같다","보다","이것","저것","그리고","그러나", "댓글"])
-
-def get_nouns(text):
-    # 1) 한국어 명사 추출 (Kiwi)
-    tokens = kiwi.tokenize(text)
-    korean_nouns = [token.form for token in tokens if token.tag.startswith("NN")]
-    korean_nouns = [n for n in korean_nouns if len(n) > 1 and n not in stopwords]
-
-    # 2) 영어 단어 추출 (2글자 이상)
-    english_words = re.findall(r'\b[A-Za-z]{2,}\b', text)
-    english_stopwords = set(['the', 'is', 'are', 'was', 'were', 'of', 'to', 'and', 'in', 'on', 'at', 'show', 'gn'])
-    english_words = [w.upper() for w in english_words if w.lower() not in english_stopwords]
-
-    # 3) 합치기
-    return korean_nouns + english_words
-
-driver = get_driver()
+pool = DriverPool(size=1, max_pages=30, headless=True, lean=True)
 
 try:
-    all_text = ""
-    total_titles = 0
-
-    for p in range(1, 100):
-        titles = get_titles(driver, page=p)
-        if not titles:
-            break
-        total_titles += len(titles)
-        all_text += " " + " ".join(titles)
+    titles = paginate(lambda p: get_titles(pool, page=p), item_key=lambda t: t, max_pages=99, label="GeekNews")
 
 finally:
-    driver.quit()
+    pool.close()
+    print_fetch_stats()
 
-cleaned = clean_kor(all_text)
-tokens = get_nouns(cleaned)
-freq = Counter(tokens)
+# 제목별로 배치 토큰화해서 바로 빈도에 더한다
+freq = count_terms(titles, source="geeknews")
+
+# 추세 저장소에는 이전 실행에서 못 본 제목만 오늘 날짜로 더한다
+with SeenStore() as seen:
+    known = seen.keys("geeknews")
+    record_titles("geeknews", "all", [t for t in titles if t not in known])
+    seen.add("geeknews", titles)
+print_trends("geeknews")
 
 if not freq:
+    print_load_times()
     raise SystemExit
 
-# 워드클라우드 생성
-wc = WordCloud(
-    font_path="C:/Windows/Fonts/malgun.ttf",  # 환경에 맞게 경로 조정
-    width=800,
-    height=600,
-    background_color="white"
-)
-wc.generate_from_frequencies(freq)
-
-plt.figure(figsize=(10, 8))
-plt.imshow(wc, interpolation="bilinear")
-plt.axis("off")
-plt.tight_layout()
-plt.savefig("./final_project/WebCrawling/geeknewsCrawling.png", dpi=200)
-plt.show()
+# 워드클라우드 생성 (wordcloud/matplotlib은 여기서 처음 불러온다)
+render_wordcloud(freq, "./final_project/WebCrawling/geeknewsCrawling.png")
+print_load_times()
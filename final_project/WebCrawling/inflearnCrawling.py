@@ -1,148 +1,229 @@
-from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+import os
 
 import pandas as pd
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+from driver_pool import DriverPool, create_driver
+from ratelimit import bucket_for
+from pagination import Paginator
+from seen_store import SeenStore
 
 
+# max_pages는 상한이고, 실제로는 Paginator가 목록 끝에서 먼저 멈춘다
 CATEGORIES = {
-    'artificial-intelligence': {'name': 'AI 기술', 'max_pages': 9},
-    'Applied-ai': {'name': 'AI 활용', 'max_pages': 7}
+    'artificial-intelligence': {'name': 'AI 기술', 'max_pages': 30},
+    'Applied-ai': {'name': 'AI 활용', 'max_pages': 30}
 }
 
 
-def init_driver(headless=True):
+COURSE_SELECTOR = 'a[href*="/course/"]'
+PAGE_RETRIES = 2  # 병렬 수집에서 실패한 페이지를 다른 브라우저로 다시 시도하는 횟수
+
+
+def init_driver(headless=True, lean=True):
     """Chrome WebDriver 초기화"""
-    chrome_options = Options()
-    
-    if headless:
-        chrome_options.add_argument('--headless=new')
-    
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--disable-software-rasterizer')
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-logging')
-    chrome_options.add_argument('--log-level=3')
-    chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('--start-maximized')
-    chrome_options.add_argument('--ignore-certificate-errors')
-    chrome_options.add_argument('--ignore-ssl-errors')
-    chrome_options.add_argument(
-        'user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    )
-    chrome_options.page_load_strategy = 'normal'
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.set_page_load_timeout(30)
-    driver.implicitly_wait(10)
-    return driver
+    return create_driver(headless=headless, page_load_timeout=30, implicit_wait=10, lean=lean)
 
 
 def scroll_to_bottom(driver, pause=0.8, max_scroll=20):
-    """페이지 끝까지 스크롤"""
+    """
+    페이지 끝까지 스크롤.
+    매번 pause초를 다 쉬지 않고, 문서 높이가 늘어나는 즉시 다음 스크롤로 넘어간다.
+    pause초 안에 높이가 그대로면 끝으로 본다.
+    """
     last_height = driver.execute_script("return document.body.scrollHeight")
     for _ in range(max_scroll):
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(pause)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
+        try:
+            WebDriverWait(driver, pause, poll_frequency=0.05).until(
+                lambda d: d.execute_script("return document.body.scrollHeight") > last_height
+            )
+        except TimeoutException:
             break
-        last_height = new_height
+        last_height = driver.execute_script("return document.body.scrollHeight")
 
 
-def crawl_category_with_selenium(driver, category_slug: str, category_name: str, max_pages: int):
-    course_data = []
-    wait = WebDriverWait(driver, 15)
+def crawl_course_page(driver, category_slug: str, category_name: str, page: int):
+    """카테고리의 한 페이지에서 강의 제목 수집 (카드가 없으면 빈 리스트)"""
+    if page == 1:
+        url = f"https://www.inflearn.com/courses/{category_slug}"
+    else:
+        url = f"https://www.inflearn.com/courses/{category_slug}?page_number={page}"
 
-    for page in range(1, max_pages + 1):
-        if page == 1:
-            url = f"https://www.inflearn.com/courses/{category_slug}"
-        else:
-            url = f"https://www.inflearn.com/courses/{category_slug}?page_number={page}"
+    bucket_for(url).acquire()
+    driver.get(url)
 
-        try:
-            driver.get(url)
+    try:
+        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, COURSE_SELECTOR)))
+    except Exception:
+        pass
 
-            try:
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'main')))
-            except Exception:
-                time.sleep(0.1)
-            
-            scroll_to_bottom(driver, pause=0.5, max_scroll=15)
-
-            cards = []
-            selectors = [
-                'a[href*="/course/"]',
-                'div.course_card_item a',
-                'div[class*="course"] a',
-                'article a[href*="/course/"]'
-            ]
-            
-            for selector in selectors:
-                try:
-                    cards = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if cards:
-                        break
-                except Exception:
-                    continue
-            
-            if not cards:
+    scroll_to_bottom(driver, pause=0.5, max_scroll=15)
+
+    cards = []
+    selectors = [
+        COURSE_SELECTOR,
+        'div.course_card_item a',
+        'div[class*="course"] a',
+        'article a[href*="/course/"]'
+    ]
+
+    for selector in selectors:
+        try:
+            cards = driver.find_elements(By.CSS_SELECTOR, selector)
+            if cards:
                 break
+        except Exception:
+            continue
 
-            page_titles = set()
+    page_titles = set()
 
-            for card in cards:
-                try:
-                    text = card.text.strip()
-                    if not text:
-                        continue
+    for card in cards:
+        try:
+            text = card.text.strip()
+            if not text:
+                continue
 
-                    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-                    if not lines:
-                        continue
+            lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+            if not lines:
+                continue
 
-                    title = lines[0]
+            title = lines[0]
 
-                    if len(title) < 5:
-                        continue
-                    if not any(c.isalpha() for c in title):
-                        continue
+            if len(title) < 5:
+                continue
+            if not any(c.isalpha() for c in title):
+                continue
 
-                    page_titles.add(title)
+            page_titles.add(title)
 
-                except Exception:
-                    continue
+        except Exception:
+            continue
 
-            if not page_titles:
-                break
+    return [
+        {'category': category_name, 'category_slug': category_slug, 'title': title}
+        for title in page_titles
+    ]
+
+
+def course_key(course):
+    return course['title']
 
-            for title in page_titles:
-                course_data.append({
-                    'category': category_name,
-                    'category_slug': category_slug,
-                    'title': title
-                })
 
+def crawl_category_with_selenium(driver, category_slug: str, category_name: str, max_pages: int):
+    paginator = Paginator(course_key)
+    course_data = []
+
+    for page in range(1, max_pages + 1):
+        try:
+            page_courses = crawl_course_page(driver, category_slug, category_name, page)
         except Exception as e:
-            if "chrome" in str(e).lower() or "driver" in str(e).lower():
-                break
-            continue
+            print(f"  {category_name} {page}페이지 실패: {e}")
+            page_courses = None  # Paginator에는 빈 페이지가 아니라 요청 실패로 전달
+
+        course_data.extend(paginator.feed(page_courses))
+        if paginator.done:
+            break
 
+    reason = paginator.stop_reason or f"최대 {max_pages}페이지"
+    print(f"{category_name}: {paginator.pages}페이지 확인 (종료: {reason})")
     return course_data
 
 
-def crawl_inflearn_ai_courses(output_csv: str = "./final_project/WebCrawling/inflearnCrawling.csv", headless: bool = True):
-    """인프런 AI 강좌 크롤링"""
+def crawl_pages_in_parallel(workers: int = 3, headless: bool = True):
+    """
+    (카테고리, 페이지) 조합을 여러 브라우저에 나눠서 동시에 수집.
+    한 라운드에 workers개 페이지를 아직 끝나지 않은 카테고리들에 나눠 요청하고,
+    결과를 페이지 순서대로 카테고리별 Paginator에 넣어 목록 끝을 판단한다.
+    브라우저는 DriverPool에서 빌려 쓰고, 실패한 페이지는 PAGE_RETRIES번까지 다시 시도한다.
+    그래도 실패하면 그 카테고리는 "페이지 요청 실패"로 멈추고 끝에 종료 이유를 출력한다.
+    """
+    paginators = {slug: Paginator(course_key) for slug in CATEGORIES}
+    next_page = {slug: 1 for slug in CATEGORIES}
+    all_courses = []
+
+    def run(task):
+        for attempt in range(PAGE_RETRIES + 1):
+            try:
+                with pool.driver() as driver:
+                    return crawl_course_page(driver, *task)
+            except Exception as e:
+                if attempt == PAGE_RETRIES:
+                    print(f"  {task[1]} {task[2]}페이지 실패: {e}")
+        return None  # Paginator에는 빈 페이지가 아니라 요청 실패로 전달
+
+    with DriverPool(size=workers, max_pages=20, headless=headless,
+                    page_load_timeout=30, implicit_wait=10, lean=True) as pool:
+        pool.warm_up()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                active = [
+                    slug for slug, info in CATEGORIES.items()
+                    if not paginators[slug].done and next_page[slug] <= info['max_pages']
+                ]
+                if not active:
+                    break
+
+                tasks = []
+                for i in range(workers):
+                    slug = active[i % len(active)]
+                    if next_page[slug] > CATEGORIES[slug]['max_pages']:
+                        continue
+                    tasks.append((slug, CATEGORIES[slug]['name'], next_page[slug]))
+                    next_page[slug] += 1
+
+                for (slug, _, _), page_courses in zip(tasks, executor.map(run, tasks)):
+                    if not paginators[slug].done:
+                        all_courses.extend(paginators[slug].feed(page_courses))
+
+    for slug, info in CATEGORIES.items():
+        paginator = paginators[slug]
+        reason = paginator.stop_reason or f"최대 {info['max_pages']}페이지"
+        print(f"{info['name']}: {paginator.pages}페이지 확인 (종료: {reason})")
+    return all_courses
+
+
+def save_courses(all_courses, output_csv, merge_existing=False):
+    """merge_existing=True면 기존 CSV에 새 강의를 합쳐서 (중복 제거·정렬 후) 다시 저장"""
+    if all_courses:
+        df = pd.DataFrame(all_courses)
+        if merge_existing and os.path.exists(output_csv):
+            df = pd.concat([pd.read_csv(output_csv, encoding="utf-8-sig"), df], ignore_index=True)
+        df_unique = df.drop_duplicates(subset=['title'])
+        df_unique = df_unique.sort_values(['category', 'title']).reset_index(drop=True)
+        df_unique.to_csv(output_csv, index=False, encoding="utf-8-sig")
+
+
+def crawl_inflearn_ai_courses(output_csv: str = "./final_project/WebCrawling/inflearnCrawling.csv", headless: bool = True,
+                              workers: int = 1, incremental: bool = False):
+    """
+    인프런 AI 강좌 크롤링 (workers > 1이면 여러 브라우저로 병렬 수집).
+    incremental=True면 새 강의만 기존 CSV에 합친다.
+    목록이 최신순 정렬이 아니라서 이전 실행에서 본 강의가 나와도 멈추지 않고 끝까지 본 뒤 걸러낸다.
+    """
+    with SeenStore() as store:
+        if workers > 1:
+            all_courses = crawl_pages_in_parallel(workers=workers, headless=headless)
+        else:
+            all_courses = crawl_serially(headless=headless)
+
+        if incremental:
+            known = store.keys("inflearn")
+            new_courses = [course for course in all_courses if course_key(course) not in known]
+            save_courses(new_courses, output_csv, merge_existing=True)
+        else:
+            save_courses(all_courses, output_csv)
+        added = store.add("inflearn", (course_key(course) for course in all_courses))
+        print(f"새 강의 {added}개")
+
+
+def crawl_serially(headless: bool = True):
+    """브라우저 하나로 카테고리를 차례로 수집"""
     driver = None
     all_courses = []
 
@@ -157,8 +238,8 @@ def crawl_inflearn_ai_courses(output_csv: str = "./final_project/WebCrawling/inf
                 info['max_pages']
             )
             all_courses.extend(courses)
-    except Exception:
-        pass
+    except Exception as e:
+        print(f"브라우저 오류로 수집 중단: {e}")
     finally:
         if driver:
             try:
@@ -166,12 +247,8 @@ def crawl_inflearn_ai_courses(output_csv: str = "./final_project/WebCrawling/inf
             except Exception:
                 pass
 
-    if all_courses:
-        df = pd.DataFrame(all_courses)
-        df_unique = df.drop_duplicates(subset=['title'])
-        df_unique = df_unique.sort_values(['category', 'title']).reset_index(drop=True)
-        df_unique.to_csv(output_csv, index=False, encoding="utf-8-sig")
+    return all_courses
 
 
 if __name__ == "__main__":
-    crawl_inflearn_ai_courses(headless=True)
+    crawl_inflearn_ai_courses(headless=True, workers=3, incremental=True)
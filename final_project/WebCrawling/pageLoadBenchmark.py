@@ -0,0 +1,114 @@
+"""
+크롤러별 페이지 로드 시간/전송 바이트 비교: 기본(normal) 프로필 vs lean 프로필.
+
+    python final_project/WebCrawling/pageLoadBenchmark.py [반복 횟수]
+
+로드 시간은 driver.get()부터 각 크롤러가 기다리는 selector가 나타날 때까지,
+전송 바이트는 Chrome 성능 로그의 Network.loadingFinished.encodedDataLength 합계다.
+바이트는 selector가 나타난 뒤에도 document.readyState가 complete가 되고
+네트워크 이벤트가 NETWORK_IDLE초 동안 없을 때까지 기다렸다가 센다 (뒤늦게 받는 리소스 포함).
+"""
+import json
+import sys
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from driver_pool import create_driver, quit_driver
+
+# 크롤러 이름: (URL, 해당 크롤러가 기다리는 selector)
+TARGETS = {
+    "bootcamp": ("https://boottent.com/camps?categories=data", "#default-bootcamp-list tr[data-index]"),
+    "inflearn": ("https://www.inflearn.com/courses/artificial-intelligence", 'a[href*="/course/"]'),
+    "geeknews": ("https://news.hada.io/?page=1", 'a[href*="topic?id="]'),
+    "okky": ("https://okky.kr/community/ai?page=1", 'main a[href*="/articles/"][href*="topic=ai"]'),
+    "yozm": ("https://yozm.wishket.com/magazine/list/develop/?page=1", 'a[href*="/magazine/detail/"]'),
+}
+
+
+NETWORK_IDLE = 0.5  # 이 시간(초) 동안 네트워크 이벤트가 없으면 로드가 끝난 것으로 본다
+
+
+def read_network_log(driver):
+    """마지막으로 읽은 뒤 쌓인 성능 로그에서 (전송 바이트 합계, 네트워크 이벤트 수)"""
+    total = events = 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        method = message.get("method", "")
+        if method.startswith("Network."):
+            events += 1
+        if method == "Network.loadingFinished":
+            total += message["params"].get("encodedDataLength", 0)
+    return total, events
+
+
+def transferred_bytes(driver, timeout=10):
+    """readyState가 complete가 되고 네트워크가 NETWORK_IDLE초 조용해질 때까지 로그를 모아 전송 바이트 합계"""
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    except TimeoutException:
+        pass
+
+    total = 0
+    deadline = time.perf_counter() + timeout
+    quiet_since = time.perf_counter()
+    while time.perf_counter() < deadline:
+        nbytes, events = read_network_log(driver)
+        total += nbytes
+        now = time.perf_counter()
+        if events:
+            quiet_since = now
+        elif now - quiet_since >= NETWORK_IDLE:
+            break
+        time.sleep(0.1)
+    return total
+
+
+def measure(driver, url, selector, timeout=30):
+    driver.get_log("performance")  # 이전 페이지 로그 비우기
+    started = time.perf_counter()
+    driver.get(url)
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+        found = True
+    except TimeoutException:
+        found = False
+    elapsed = time.perf_counter() - started
+    return elapsed, transferred_bytes(driver), found
+
+
+def run_benchmark(repeat=3):
+    results = {}
+    for profile, lean in (("normal", False), ("lean", True)):
+        driver = create_driver(headless=True, lean=lean, perf_log=True)
+        try:
+            # 반복 측정이 캐시 덕을 보지 않도록 캐시 끄기
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+            for name, (url, selector) in TARGETS.items():
+                samples = [measure(driver, url, selector) for _ in range(repeat)]
+                results[(name, profile)] = (
+                    min(s[0] for s in samples),
+                    min(s[1] for s in samples),
+                    all(s[2] for s in samples),
+                )
+        finally:
+            quit_driver(driver)
+
+    print(f"\n페이지 로드 벤치마크 ({repeat}회 중 최소값)")
+    print(f"{'크롤러':<10} {'normal(s)':>10} {'lean(s)':>10} {'normal(KB)':>12} {'lean(KB)':>12}  selector")
+    print("-" * 72)
+    for name in TARGETS:
+        n_time, n_bytes, n_found = results[(name, "normal")]
+        l_time, l_bytes, l_found = results[(name, "lean")]
+        status = "OK" if (n_found and l_found) else "일부 실패"
+        print(f"{name:<10} {n_time:>10.2f} {l_time:>10.2f} {n_bytes / 1024:>12,.0f} {l_bytes / 1024:>12,.0f}  {status}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
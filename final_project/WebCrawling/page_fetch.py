@@ -0,0 +1,117 @@
+"""
+목록 페이지 HTML 가져오기.
+
+서버에서 렌더링되는 페이지는 일반 HTTP GET(커넥션 풀 재사용)으로 충분하므로 먼저 그렇게 받아 보고,
+필요한 selector가 HTML에 없을 때만 DriverPool의 브라우저로 다시 연다.
+두 경로 모두 ratelimit의 호스트별 토큰 버킷을 거친다.
+"""
+import threading
+import time
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+import ratelimit
+from driver_pool import USER_AGENT
+
+HTTP_TIMEOUT = 15     # 초
+BROWSER_WAIT = 10     # 브라우저에서 selector를 기다릴 최대 시간 (초)
+MAX_RETRIES = 2
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# 어떤 경로로 가져왔는지 집계 (실행 끝에 출력용)
+fetch_stats = {"http": 0, "browser": 0}
+_stats_lock = threading.Lock()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            # 재시도는 fetch_html()에서 속도 제한과 함께 처리
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=0)
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": "gzip, deflate",
+                "Accept-Language": "ko-KR,ko;q=0.9",
+            })
+    return _session
+
+
+def fetch_html(url, timeout=HTTP_TIMEOUT):
+    """
+    일반 HTTP GET. 실패하면 None (본문은 bytes 그대로 돌려서 인코딩은 BeautifulSoup이 판단).
+    429/5xx와 연결 오류는 MAX_RETRIES번까지 재시도하고, 429면 그 호스트 속도를 낮춘다.
+    """
+    bucket = ratelimit.bucket_for(url)
+    for attempt in range(MAX_RETRIES + 1):
+        bucket.acquire()
+        started = time.perf_counter()
+        try:
+            response = get_session().get(url, timeout=timeout)
+        except requests.RequestException:
+            response = None
+        ratelimit.record("fetching", time.perf_counter() - started)
+        ratelimit.record("requests")
+
+        if response is not None and response.status_code not in RETRY_STATUS:
+            bucket.recover()
+            return response.content if response.status_code == 200 else None
+        if attempt == MAX_RETRIES:
+            ratelimit.record("failures")
+            return None
+
+        ratelimit.record("retries")
+        retry_after = ratelimit.retry_after_seconds(response) if response is not None else None
+        if response is not None and response.status_code == 429:
+            bucket.penalize(retry_after if retry_after is not None else ratelimit.backoff_delay(attempt))
+        else:
+            ratelimit.sleep_backoff(attempt, retry_after)
+
+
+def count_fetch(kind):
+    with _stats_lock:
+        fetch_stats[kind] += 1
+
+
+def load_page(url, selector, pool):
+    """
+    url을 BeautifulSoup으로 돌려준다.
+    HTTP 응답에 selector가 하나라도 있으면 그대로 쓰고, 없으면 pool에서 브라우저를 빌려 다시 연다.
+    """
+    html = fetch_html(url)
+    if html is not None:
+        soup = BeautifulSoup(html, "html.parser")
+        if soup.select_one(selector) is not None:
+            count_fetch("http")
+            return soup
+
+    ratelimit.bucket_for(url).acquire()
+    with pool.driver() as driver:
+        driver.get(url)
+        try:
+            WebDriverWait(driver, BROWSER_WAIT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+            )
+        except TimeoutException:
+            pass
+        page_source = driver.page_source
+
+    count_fetch("browser")
+    return BeautifulSoup(page_source, "html.parser")
+
+
+def print_fetch_stats():
+    print(f"페이지 로드: HTTP {fetch_stats['http']}건, 브라우저 {fetch_stats['browser']}건")
+    ratelimit.print_timing_stats()
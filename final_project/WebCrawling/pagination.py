@@ -0,0 +1,79 @@
+"""
+페이지 번호로 넘기는 목록 크롤링의 공용 종료 판단.
+
+고정된 페이지 수 대신 아래 경우에 멈춘다.
+- 페이지가 비어 있음
+- 페이지 요청이 (재시도 후에도) 실패함 (feed(None))
+- 이전 페이지와 같은 항목들이 다시 나옴 (마지막 페이지를 넘기면 같은 페이지를 돌려주는 사이트)
+- 새 항목이 하나도 없음
+- 이전 실행에서 이미 수집한 항목에 도달함 (known에 들어 있는 key)
+"""
+
+
+class Paginator:
+    """
+    페이지 결과를 순서대로 feed()에 넣으면 새 항목만 돌려주고, 더 볼 필요가 없으면 done이 된다.
+    병렬로 여러 페이지를 받아 오는 경우에도 페이지 순서대로만 넣으면 된다.
+    요청에 실패한 페이지는 None을 넣는다 (빈 페이지와 구분해서 "페이지 요청 실패"로 멈춘다).
+    """
+
+    def __init__(self, item_key, known=None):
+        self.item_key = item_key
+        self.known = known if known is not None else ()
+        self.seen = set()
+        self.prev_keys = None
+        self.pages = 0
+        self.stop_reason = None
+
+    @property
+    def done(self):
+        return self.stop_reason is not None
+
+    def feed(self, items):
+        self.pages += 1
+        if items is None:
+            self.stop_reason = "페이지 요청 실패"
+            return []
+        if not items:
+            self.stop_reason = "빈 페이지"
+            return []
+
+        keys = [self.item_key(item) for item in items]
+        if self.prev_keys is not None and set(keys) == self.prev_keys:
+            self.stop_reason = "이전 페이지와 같은 항목"
+            return []
+        self.prev_keys = set(keys)
+
+        new_items = []
+        for item, key in zip(items, keys):
+            if key not in self.seen:
+                self.seen.add(key)
+                new_items.append((item, key))
+
+        if not new_items:
+            self.stop_reason = "새 항목 없음"
+            return []
+
+        fresh = [item for item, key in new_items if key not in self.known]
+        if len(fresh) < len(new_items):
+            self.stop_reason = "이전 실행에서 수집한 항목에 도달"
+        return fresh
+
+
+def paginate(fetch_page, item_key, max_pages=100, known=None, start_page=1, label=""):
+    """
+    fetch_page(page)를 start_page부터 차례로 호출해서 새 항목을 모은다.
+    max_pages는 안전장치로 둔 상한이고, 보통은 그 전에 Paginator가 멈춘다.
+    """
+    paginator = Paginator(item_key, known)
+    items = []
+
+    for page in range(start_page, start_page + max_pages):
+        items.extend(paginator.feed(fetch_page(page)))
+        if paginator.done:
+            break
+    else:
+        paginator.stop_reason = f"최대 {max_pages}페이지"
+
+    print(f"{label} {paginator.pages}페이지 확인, {len(items)}개 수집 (종료: {paginator.stop_reason})".strip())
+    return items
@@ -0,0 +1,138 @@
+"""
+호스트별 요청 속도 제한(토큰 버킷)과 재시도 대기 정책.
+
+crawling_project/crawling_example/ratelimit.py의 복사본이다. 두 폴더의 스크립트는 각자 폴더에서 실행되어
+서로 import할 수 없으므로 그대로 복사해 두었고, 이 설명과 HOST_RATES/DEFAULT_RATE만 다르다.
+나머지를 고치면 두 파일에 똑같이 반영한다.
+
+- 호스트마다 TokenBucket 하나를 모든 스레드가 같이 쓴다 (HTTP 요청과 브라우저 페이지 열기 모두). 속도는 HOST_RATES에서 정한다.
+- 429를 받으면 그 호스트의 속도를 절반으로 낮추고 Retry-After(없으면 백오프)만큼 새 요청을 멈춘 뒤,
+  성공할 때마다 조금씩 원래 속도로 되돌린다.
+- 재시도 대기는 지수 백오프 + 지터 (Retry-After가 있으면 그 값).
+- 속도 제한으로 기다린 시간, 요청에 걸린 시간, 재시도 대기 시간을 timing_stats에 모은다.
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# 호스트: (초당 요청 수, 한 번에 몰아 보낼 수 있는 최대 요청 수)
+HOST_RATES = {
+    "news.hada.io": (2, 2),
+    "okky.kr": (2, 2),
+    "yozm.wishket.com": (1, 1),
+    "www.inflearn.com": (2, 3),
+    "boottent.com": (1, 1),
+}
+DEFAULT_RATE = (1, 1)
+
+BACKOFF_BASE = 0.5        # 초: 0.5, 1, 2, 4 ... (지터 포함)
+BACKOFF_CAP = 30          # 한 번 재시도 대기의 최대값 (초)
+MAX_RETRY_AFTER = 60      # 서버가 더 길게 요구해도 이 이상은 기다리지 않음 (초)
+MIN_RATE_RATIO = 0.1      # 429로 낮출 수 있는 최저 속도 (원래 속도 대비)
+RECOVERY_STEP = 0.05      # 성공 한 번마다 원래 속도의 5%씩 회복
+
+timing_stats = {"throttled": 0.0, "fetching": 0.0, "backoff": 0.0, "requests": 0, "retries": 0, "failures": 0}
+_stats_lock = threading.Lock()
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def record(key, amount=1):
+    with _stats_lock:
+        timing_stats[key] += amount
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 차는 토큰 버킷 (최대 burst개).
+    acquire()는 토큰을 하나 예약하고 쓸 수 있을 때까지 기다린다. 기다리는 스레드끼리는 예약 순서대로 나간다.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            delay = max(delay, self.blocked_until - now)
+        if delay > 0:
+            time.sleep(delay)
+            record("throttled", delay)
+        return delay
+
+    def penalize(self, pause):
+        """429를 받았을 때: 속도를 절반으로 줄이고 pause초 동안 새 요청을 멈춘다"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.max_rate * MIN_RATE_RATIO, self.rate / 2)
+            self.blocked_until = max(self.blocked_until, now + pause)
+
+    def recover(self):
+        with self._lock:
+            if self.rate >= self.max_rate:
+                return
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
+
+
+def bucket_for(url):
+    """url 호스트의 공유 TokenBucket"""
+    host = (urlsplit(url).hostname or "").lower()
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(*HOST_RATES.get(host, DEFAULT_RATE))
+        return _buckets[host]
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """attempt번째(0부터) 재시도 전 대기 시간: 지수 증가분의 절반 + 나머지 절반 범위의 무작위 지터"""
+    ceiling = min(cap, base * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def retry_after_seconds(response):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초로. 없거나 못 읽으면 None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def sleep_backoff(attempt, retry_after=None, base=BACKOFF_BASE):
+    """재시도 전에 기다린다 (retry_after가 있으면 그 값, 없으면 backoff_delay)"""
+    delay = retry_after if retry_after is not None else backoff_delay(attempt, base)
+    time.sleep(delay)
+    record("backoff", delay)
+    return delay
+
+
+def print_timing_stats():
+    s = timing_stats
+    print(f"요청 {s['requests']}건 (재시도 {s['retries']}건, 최종 실패 {s['failures']}건) | "
+          f"요청 {s['fetching']:.1f}s, 속도 제한 대기 {s['throttled']:.1f}s, 재시도 대기 {s['backoff']:.1f}s "
+          f"(스레드별 시간 합계)")
@@ -0,0 +1,70 @@
+"""
+증분 크롤링용으로 이미 수집한 항목 key를 저장하는 SQLite 저장소.
+
+source별로 key(글 URL, 강의 제목, 부트캠프 제목 등)를 기록해 두고,
+다음 실행에서는 Paginator(known=...)에 넘겨 이미 본 항목에 닿으면 페이지 넘김을 멈춘다.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawl_state.sqlite3")
+
+
+class SeenStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_items (
+                source     TEXT NOT NULL,
+                item_key   TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                PRIMARY KEY (source, item_key)
+            )
+            """
+        )
+        self.conn.commit()
+
+    def keys(self, source):
+        """source에서 지금까지 수집한 key 집합"""
+        rows = self.conn.execute("SELECT item_key FROM seen_items WHERE source = ?", (source,))
+        return {row[0] for row in rows}
+
+    def add(self, source, keys):
+        """새 key 기록 (이미 있는 key는 무시). 실제로 추가된 개수를 돌려준다."""
+        now = datetime.now().isoformat(timespec="seconds")
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_items (source, item_key, first_seen) VALUES (?, ?, ?)",
+                ((source, key, now) for key in keys),
+            )
+        return self.conn.total_changes - before
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def append_new_rows(df, path, key_column):
+    """
+    df 중 path(CSV)에 아직 없는 key_column 값을 가진 행만 뒤에 붙인다.
+    파일이 없으면 새로 만든다. 붙인 행 수를 돌려준다.
+    """
+    if os.path.exists(path):
+        existing = pd.read_csv(path, encoding="utf-8-sig", usecols=[key_column])
+        df = df[~df[key_column].isin(set(existing[key_column]))]
+        if not df.empty:
+            df.to_csv(path, mode="a", header=False, index=False, encoding="utf-8")
+    else:
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    return len(df)
@@ -0,0 +1,137 @@
+"""
+단어 추출 벤치마크: 예전 clean_kor + get_nouns vs text_analytics 단일 패스 추출기.
+
+    python final_project/WebCrawling/termBenchmark.py [--titles 1000000]
+
+합성 제목 코퍼스로 두 단계를 잰다.
+- 정제만: 예전 clean_kor(re.sub 두 번, 매번 패턴 조회) vs 미리 컴파일한 정규식 한 번
+- 추출+필터: 예전 extract_terms(text, tokens)(토큰 순회 + 영어 re.findall) + filter_terms(불용어 두 번 검사)
+        vs 새 extract_terms(tokens)(토큰 한 번 순회) + frozenset 한 번 검사
+  BATCH_SIZE개씩 흘려 보내면서 배치마다 Kiwi 토큰화는 측정 밖에서 한 번만 하고, 두 방식에 같은 토큰을 넘긴다.
+  메모리에는 배치 하나 분량의 토큰만 있으므로 제목 100만 개도 그대로 돌린다.
+"""
+import argparse
+import random
+import re
+import time
+from collections import Counter
+
+from text_analytics import (BATCH_SIZE, COMMON_ENGLISH_STOPWORDS, COMMON_STOPWORDS, clean_kor, extract_terms,
+                            filter_terms, get_kiwi, iter_batches, stopwords_for)
+
+KOREAN_NOUNS = [
+    "데이터", "모델", "서비스", "개발", "보안", "클라우드", "검색", "추천", "플랫폼", "엔지니어",
+    "스타트업", "오픈소스", "성능", "데이터베이스", "인공지능", "프론트엔드", "백엔드", "자동화", "배포", "장애",
+]
+PARTICLES = ["", "", "을", "를", "의", "에서", "으로", "과", "는", "이"]
+ENGLISH_WORDS = [
+    "AI", "LLM", "GPT", "Python", "Rust", "Kubernetes", "API", "React", "Show", "GN", "the", "for", "with",
+]
+ENDINGS = ["만들기", "정리", "소개합니다", "출시", "분석", "후기", "하는 법", "했습니다"]
+PUNCTUATION = ["", "", ":", "-", "!", "?", "(", ")", "[", "]", "…", "→"]
+
+# 예전 geeknewsCrawling이 넘기던 불용어 (영어는 소문자 그대로)
+LEGACY_STOPWORDS = set(COMMON_STOPWORDS) | {"댓글"}
+LEGACY_ENGLISH_STOPWORDS = set(COMMON_ENGLISH_STOPWORDS) | {"show", "gn"}
+
+
+def make_synthetic_titles(n, seed=0):
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(3, 7)):
+            if rng.random() < 0.3:
+                parts.append(rng.choice(ENGLISH_WORDS) + rng.choice(PARTICLES))
+            else:
+                parts.append(rng.choice(KOREAN_NOUNS) + rng.choice(PARTICLES))
+            parts[-1] += rng.choice(PUNCTUATION)
+        parts.append(rng.choice(ENDINGS))
+        titles.append(" ".join(parts))
+    return titles
+
+
+# --- 예전 text_analytics의 함수 그대로 (비교 기준) ---
+
+def legacy_clean_kor(text):
+    text = re.sub(r"[^가-힣A-Za-z0-9\s]", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def legacy_extract_terms(text, tokens):
+    korean_nouns = [token.form for token in tokens if token.tag.startswith("NN") and len(token.form) > 1]
+    english_words = [w.upper() for w in re.findall(r'\b[A-Za-z]{2,}\b', text)]
+    return korean_nouns + english_words
+
+
+def legacy_filter_terms(terms, stopwords=(), english_stopwords=()):
+    return [t for t in terms if t not in stopwords and t.lower() not in english_stopwords]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def legacy_count(analyzed, freq):
+    for text, tokens in analyzed:
+        terms = legacy_extract_terms(text, tokens)
+        freq.update(legacy_filter_terms(terms, LEGACY_STOPWORDS, LEGACY_ENGLISH_STOPWORDS))
+
+
+def new_count(analyzed, stop, freq):
+    for _, tokens in analyzed:
+        freq.update(filter_terms(extract_terms(tokens), stop))
+
+
+def print_top_diff(legacy_freq, new_freq, top_n=20):
+    """상위 top_n 중 한쪽에만 있는 단어를 "단어(이쪽 빈도 / 다른 쪽 빈도)"로 출력"""
+    legacy_top = [term for term, _ in legacy_freq.most_common(top_n)]
+    new_top = [term for term, _ in new_freq.most_common(top_n)]
+    only_legacy = [term for term in legacy_top if term not in new_top]
+    only_new = [term for term in new_top if term not in legacy_top]
+
+    print(f"상위 {top_n}개 단어 일치: {top_n - len(only_legacy)}/{top_n}")
+    for label, terms, freq, other in (("예전에만", only_legacy, legacy_freq, new_freq),
+                                      ("새 방식에만", only_new, new_freq, legacy_freq)):
+        if terms:
+            print(f"  {label}: " + ", ".join(f"{t}({freq[t]:,} / {other[t]:,})" for t in terms))
+
+
+def run_benchmark(n=1_000_000, batch_size=BATCH_SIZE):
+    print(f"합성 제목 {n:,}개 생성 중...")
+    titles = make_synthetic_titles(n)
+    kiwi = get_kiwi()  # 모델 로딩은 측정에서 뺀다
+    stop = stopwords_for("geeknews")
+
+    legacy_clean = new_clean = legacy_total = new_total = 0.0
+    legacy_freq, new_freq = Counter(), Counter()
+    for done, batch in enumerate(iter_batches(titles, batch_size), 1):
+        elapsed, _ = timed(lambda: [legacy_clean_kor(t) for t in batch])
+        legacy_clean += elapsed
+        elapsed, cleaned = timed(lambda: [clean_kor(t) for t in batch])
+        new_clean += elapsed
+
+        # 토큰화는 측정 밖에서 배치당 한 번, 두 방식이 같은 토큰을 쓴다
+        analyzed = list(zip(cleaned, kiwi.tokenize(cleaned)))
+        legacy_total += timed(lambda: legacy_count(analyzed, legacy_freq))[0]
+        new_total += timed(lambda: new_count(analyzed, stop, new_freq))[0]
+
+        if done % 100 == 0:
+            print(f"  {min(done * batch_size, n):,}/{n:,}")
+
+    print(f"\n단어 추출 벤치마크 (제목 {n:,}개)")
+    print(f"{'단계':<10} {'예전(s)':>10} {'새 방식(s)':>12} {'배속':>8}")
+    print("-" * 44)
+    print(f"{'정제만':<10} {legacy_clean:>10.2f} {new_clean:>12.2f} {legacy_clean / new_clean:>7.1f}x")
+    print(f"{'추출+필터':<10} {legacy_total:>10.2f} {new_total:>12.2f} {legacy_total / new_total:>7.1f}x")
+    print_top_diff(legacy_freq, new_freq)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="단어 추출 벤치마크")
+    parser.add_argument("--titles", type=int, default=1_000_000, help="합성 제목 수")
+    args = parser.parse_args()
+    run_benchmark(args.titles)
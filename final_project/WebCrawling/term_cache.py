@@ -0,0 +1,81 @@
+"""
+제목 → 추출 단어 목록 디스크 캐시 (SQLite).
+
+key는 정규화한 제목(clean_kor 결과)의 sha1이고, 값은 불용어를 빼기 전의 단어 목록이다.
+그래서 스크립트마다 불용어 목록이 달라도 같은 캐시를 같이 쓴다.
+항목 수가 MAX_ENTRIES를 넘으면 가장 오래 안 쓴 것부터 지운다.
+단어 추출 방식이 바뀌면 CACHE_VERSION을 올린다 (key에 들어가므로 옛 항목은 안 쓰이다가 밀려난다).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "term_cache.sqlite3")
+MAX_ENTRIES = 200_000
+CACHE_VERSION = 2  # 2: 영어 단어도 Kiwi 토큰(SL)에서 추출
+QUERY_CHUNK = 500  # IN (...) 한 번에 넣을 key 수 (SQLite 변수 개수 제한)
+
+
+def title_key(text):
+    return hashlib.sha1(f"{CACHE_VERSION}:{text}".encode("utf-8")).hexdigest()
+
+
+class TermCache:
+    def __init__(self, path=DEFAULT_DB_PATH, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS title_terms (
+                key       TEXT PRIMARY KEY,
+                terms     TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_title_terms_last_used ON title_terms (last_used)")
+        self.conn.commit()
+
+    def get_many(self, keys):
+        """{key: 단어 목록} (캐시에 있는 것만). 찾은 항목은 최근 사용으로 표시"""
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        with self.conn:
+            for i in range(0, len(keys), QUERY_CHUNK):
+                chunk = keys[i:i + QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = self.conn.execute(f"SELECT key, terms FROM title_terms WHERE key IN ({marks})", chunk)
+                found.update((key, json.loads(terms)) for key, terms in rows)
+                self.conn.execute(f"UPDATE title_terms SET last_used = ? WHERE key IN ({marks})", [now, *chunk])
+        return found
+
+    def put_many(self, items):
+        """items: {key: 단어 목록}"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO title_terms (key, terms, last_used) VALUES (?, ?, ?)",
+                ((key, json.dumps(terms, ensure_ascii=False), now) for key, terms in items.items()),
+            )
+            self._evict()
+
+    def _evict(self):
+        count = self.conn.execute("SELECT COUNT(*) FROM title_terms").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM title_terms WHERE key IN "
+                "(SELECT key FROM title_terms ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
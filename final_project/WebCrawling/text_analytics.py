@@ -0,0 +1,177 @@
+"""
+워드클라우드 스크립트(geeknews/okky/yzit) 공용 제목 토큰화 + 워드클라우드 그리기.
+
+제목을 하나의 긴 문자열로 합치지 않고 BATCH_SIZE개씩 Kiwi 배치 API(kiwi.tokenize(리스트))에 넘긴다.
+Kiwi(num_workers=-1)가 배치 안의 제목들을 모든 코어에 나눠 분석하고,
+결과는 제목 순서대로 나오는 대로 Counter에 더한다.
+이전 실행에서 분석한 제목은 term_cache에서 단어 목록을 꺼내 쓰고, 새 제목만 Kiwi로 분석한다.
+
+단어 추출은 제목마다 한 번만 훑는다: 미리 컴파일한 정규식 한 번으로 정제하고,
+Kiwi 토큰 한 번 순회로 한국어 명사(NN*)와 영어 단어(SL)를 같이 뽑는다.
+불용어는 소스별 frozenset (SOURCE_STOPWORDS)이고 영어 불용어는 대문자로 합쳐 두어 한 번의 in 검사로 거른다.
+
+Kiwi와 wordcloud/matplotlib은 import 시점이 아니라 처음 쓸 때 불러온다 (Kiwi는 프로세스당 하나).
+수집 결과가 없거나 캐시로 끝나는 실행은 이 비용을 내지 않는다. 걸린 시간은 print_load_times()로 본다.
+"""
+import re
+import threading
+import time
+from collections import Counter
+
+from term_cache import TermCache, title_key
+
+BATCH_SIZE = 1000
+NON_WORD = re.compile(r"[^가-힣A-Za-z0-9]+")
+FONT_PATH = "C:/Windows/Fonts/malgun.ttf"  # 환경에 맞게 경로 조정
+
+COMMON_STOPWORDS = frozenset(["하다", "되다", "있다", "같다", "보다", "이것", "저것", "그리고", "그러나"])
+COMMON_ENGLISH_STOPWORDS = frozenset(['the', 'is', 'are', 'was', 'were', 'of', 'to', 'and', 'in', 'on', 'at'])
+
+# 소스: (추가 한국어 불용어, 추가 영어 불용어)
+SOURCE_STOPWORDS = {
+    "geeknews": (["댓글"], ["show", "gn"]),
+    "okky": ([], []),
+    "yozm": (
+        ["개발자", "시간", "코드", "분전", "일전", "요즘", "올해", "인기", "댓글", "이번"],
+        ["show", "gn", "for", "with", "that", "this", "from", "by"],
+    ),
+}
+
+load_times = {}  # 불러온 것: 걸린 시간(초)
+
+_kiwi = None
+_kiwi_lock = threading.Lock()
+
+
+def get_kiwi():
+    """프로세스에서 공유하는 Kiwi (처음 부를 때 생성)"""
+    global _kiwi
+    if _kiwi is None:
+        with _kiwi_lock:
+            if _kiwi is None:
+                started = time.perf_counter()
+                from kiwipiepy import Kiwi
+                _kiwi = Kiwi(num_workers=-1)  # -1: 가용한 모든 코어 사용
+                load_times["Kiwi"] = time.perf_counter() - started
+    return _kiwi
+
+
+def load_plotting():
+    """(WordCloud, matplotlib.pyplot)을 처음 부를 때 import"""
+    started = time.perf_counter()
+    from wordcloud import WordCloud
+    import matplotlib.pyplot as plt
+    load_times.setdefault("wordcloud/matplotlib", time.perf_counter() - started)
+    return WordCloud, plt
+
+
+def clean_kor(text):
+    # 한글/영문/숫자만 남기고 나머지(연속 공백 포함)는 공백 하나로
+    return NON_WORD.sub(" ", text).strip()
+
+
+def build_stopwords(stopwords=(), english_stopwords=()):
+    """한국어 불용어 + 대문자로 바꾼 영어 불용어를 하나의 frozenset으로"""
+    return frozenset(stopwords) | frozenset(w.upper() for w in english_stopwords)
+
+
+def stopwords_for(source):
+    extra_korean, extra_english = SOURCE_STOPWORDS.get(source, ((), ()))
+    return build_stopwords(COMMON_STOPWORDS | frozenset(extra_korean),
+                           COMMON_ENGLISH_STOPWORDS | frozenset(extra_english))
+
+
+def extract_terms(tokens):
+    """
+    Kiwi 토큰을 한 번 훑어서 한국어 명사(NN*, 2글자 이상) + 영어 단어(SL, 2글자 이상, 대문자로).
+    불용어는 빼기 전 목록이다 (캐시에 그대로 저장).
+    """
+    terms = []
+    for token in tokens:
+        tag = token.tag
+        if tag.startswith("NN"):
+            if len(token.form) > 1:
+                terms.append(token.form)
+        elif tag == "SL" and len(token.form) > 1:
+            terms.append(token.form.upper())
+    return terms
+
+
+def filter_terms(terms, stop):
+    return [t for t in terms if t not in stop]
+
+
+def iter_batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def count_terms(titles, source=None, stop=None, batch_size=BATCH_SIZE, use_cache=True):
+    """
+    titles(리스트든 제너레이터든)를 batch_size개씩 토큰화하면서 단어 빈도를 센다.
+    불용어는 stop(build_stopwords 결과)이 있으면 그것, 없으면 source의 SOURCE_STOPWORDS를 쓴다.
+    use_cache=True면 캐시에 없는 제목만 Kiwi로 분석하고 그 결과를 캐시에 저장한다.
+    """
+    if stop is None:
+        stop = stopwords_for(source)
+    freq = Counter()
+    total = analyzed = 0
+    cache = TermCache() if use_cache else None
+    try:
+        for batch in iter_batches(titles, batch_size):
+            cleaned = [clean_kor(str(title)) for title in batch]
+            keys = [title_key(text) for text in cleaned]
+            terms_by_key = cache.get_many(set(keys)) if cache else {}
+
+            missing = {key: text for key, text in zip(keys, cleaned) if key not in terms_by_key}
+            if missing:
+                texts = list(missing.values())
+                new_terms = {
+                    key: extract_terms(tokens)
+                    for key, tokens in zip(missing, get_kiwi().tokenize(texts))
+                }
+                if cache:
+                    cache.put_many(new_terms)
+                terms_by_key.update(new_terms)
+                analyzed += len(new_terms)
+
+            total += len(keys)
+            for key in keys:
+                freq.update(filter_terms(terms_by_key[key], stop))
+    finally:
+        if cache:
+            cache.close()
+
+    print(f"토큰화: 제목 {total}개 중 {analyzed}개만 Kiwi로 분석 (나머지는 캐시/중복)")
+    return freq
+
+
+def render_wordcloud(freq, output_png, width=800, height=600, figsize=(10, 8), title=None, show=True,
+                     **wc_options):
+    """freq(Counter)로 워드클라우드를 그려 output_png에 저장. wc_options는 WordCloud에 그대로 넘긴다"""
+    WordCloud, plt = load_plotting()
+    wc = WordCloud(font_path=FONT_PATH, width=width, height=height, background_color="white", **wc_options)
+    wc.generate_from_frequencies(freq)
+
+    plt.figure(figsize=figsize)
+    plt.imshow(wc, interpolation="bilinear")
+    plt.axis("off")
+    if title:
+        plt.title(title, fontsize=20, pad=20)
+    plt.tight_layout()
+    plt.savefig(output_png, dpi=200, bbox_inches="tight" if title else None)
+    if show:
+        plt.show()
+
+
+def print_load_times():
+    if not load_times:
+        print("지연 로딩: 불러온 라이브러리 없음")
+        return
+    print("지연 로딩: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in load_times.items()))
@@ -0,0 +1,204 @@
+"""
+제목 단어 빈도를 (소스, 카테고리, 날짜)별로 쌓아 두는 SQLite 저장소 + 급상승 단어 조회.
+
+- 크롤러는 실행마다 처음 본 제목의 단어 빈도만 그날 칸에 더한다 (term_daily, 누적 upsert).
+  크롤링한 날과 처음 본 제목 수는 crawl_days에 남긴다 (새 제목이 없던 날도 titles=0으로).
+- 기간 합계(window)와 급상승(rising_terms)은 (source, category, day) 인덱스로 필요한 날짜 칸만 읽는다.
+  그래서 조회 비용은 기간 길이에 비례하고, 쌓인 전체 기록이나 원본 제목을 다시 훑지 않는다.
+- 급상승 점수: 날마다 빈도를 그날 새 제목 수로 나눈 비율(제목당 빈도)로 바꿔서,
+  그날 비율을 직전 baseline_days 중 새 제목이 있던 날들의 평균/표준편차와 비교한 z-score.
+  첫 실행처럼 제목이 한꺼번에 들어온 날도 비율로는 하루치 비중만 가진다.
+
+    python final_project/WebCrawling/trend_store.py --source yozm --category ai
+"""
+import argparse
+import math
+import os
+import sqlite3
+from collections import Counter
+from datetime import date, timedelta
+
+from text_analytics import count_terms
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "term_trends.sqlite3")
+MIN_STD = 1.0  # 기준 기간 빈도가 거의 일정할 때 z-score가 튀지 않도록 하는 표준편차 하한 (그날 제목 수 기준 빈도)
+
+
+def day_str(day=None):
+    return (day or date.today()).isoformat()
+
+
+class TrendStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS term_daily (
+                source   TEXT NOT NULL,
+                category TEXT NOT NULL,
+                day      TEXT NOT NULL,
+                term     TEXT NOT NULL,
+                count    INTEGER NOT NULL,
+                PRIMARY KEY (source, category, day, term)
+            );
+            CREATE INDEX IF NOT EXISTS idx_term_daily_day ON term_daily (source, day);
+            CREATE TABLE IF NOT EXISTS crawl_days (
+                source   TEXT NOT NULL,
+                category TEXT NOT NULL,
+                day      TEXT NOT NULL,
+                titles   INTEGER NOT NULL,
+                PRIMARY KEY (source, category, day)
+            );
+            """
+        )
+        self.conn.commit()
+
+    def add_counts(self, source, category, freq, titles, day=None):
+        """freq(Counter)를 그날 칸에 더한다. 같은 날 여러 번 실행하면 누적된다. freq가 비어도 크롤링한 날로 남긴다."""
+        day = day_str(day)
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO term_daily (source, category, day, term, count) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (source, category, day, term) DO UPDATE SET count = count + excluded.count
+                """,
+                ((source, category, day, term, count) for term, count in freq.items()),
+            )
+            self.conn.execute(
+                """
+                INSERT INTO crawl_days (source, category, day, titles) VALUES (?, ?, ?, ?)
+                ON CONFLICT (source, category, day) DO UPDATE SET titles = titles + excluded.titles
+                """,
+                (source, category, day, titles),
+            )
+
+    def _where(self, source, category, start, end):
+        """(WHERE 절, 파라미터). category=None이면 소스의 모든 카테고리"""
+        sql = "source = ? AND day BETWEEN ? AND ?"
+        params = [source, day_str(start), day_str(end)]
+        if category is not None:
+            sql += " AND category = ?"
+            params.append(category)
+        return sql, params
+
+    def window(self, source, days=7, category=None, end=None, top_n=30):
+        """end까지 최근 days일 동안의 단어 빈도 합계 상위 top_n [(단어, 빈도)]"""
+        end = end or date.today()
+        where, params = self._where(source, category, end - timedelta(days=days - 1), end)
+        return self.conn.execute(
+            f"SELECT term, SUM(count) AS total FROM term_daily WHERE {where} "
+            "GROUP BY term ORDER BY total DESC LIMIT ?",
+            (*params, top_n),
+        ).fetchall()
+
+    def rising_terms(self, source, category=None, day=None, baseline_days=14, min_count=3, top_n=20):
+        """
+        day의 제목당 빈도가 직전 baseline_days(새 제목이 있던 날만) 평균보다 얼마나 높은지 z-score 순으로.
+        반환: [(단어, 그날 빈도, 기준 평균, z-score)]. 기준 평균은 그날 제목 수로 환산한 기대 빈도.
+        비교할 기준 기간 데이터가 없으면 None (min_count를 넘은 단어가 없을 때의 []와 구분)
+        """
+        day = day or date.today()
+        where, params = self._where(source, category, day, day)
+        base_where, base_params = self._where(
+            source, category, day - timedelta(days=baseline_days), day - timedelta(days=1)
+        )
+
+        # 카테고리를 합친 날짜별 새 제목 수 (0인 날은 비율을 정의할 수 없어서 기준에서 뺀다)
+        day_titles = f"SELECT day, SUM(titles) AS n FROM crawl_days WHERE {base_where} GROUP BY day HAVING n > 0"
+        crawled = self.conn.execute(f"SELECT COUNT(*) FROM ({day_titles})", base_params).fetchone()[0]
+        if crawled == 0:
+            return None
+
+        titles_today = self.conn.execute(
+            f"SELECT COALESCE(SUM(titles), 0) FROM crawl_days WHERE {where}", params
+        ).fetchone()[0]
+        if titles_today == 0:
+            return []
+        today = dict(self.conn.execute(
+            f"SELECT term, SUM(count) FROM term_daily WHERE {where} GROUP BY term", params
+        ))
+
+        # 날짜별 제목당 빈도의 합/제곱합 (단어가 안 나온 날은 0으로 계산됨)
+        baseline = {
+            term: (total, total_sq)
+            for term, total, total_sq in self.conn.execute(
+                f"""
+                SELECT t.term, SUM(t.c * 1.0 / d.n), SUM((t.c * 1.0 / d.n) * (t.c * 1.0 / d.n)) FROM (
+                    SELECT term, day, SUM(count) AS c FROM term_daily WHERE {base_where} GROUP BY term, day
+                ) AS t JOIN ({day_titles}) AS d USING (day)
+                GROUP BY t.term
+                """,
+                (*base_params, *base_params),
+            )
+        }
+
+        rows = []
+        for term, count in today.items():
+            if count < min_count:
+                continue
+            total, total_sq = baseline.get(term, (0, 0))
+            mean_rate = total / crawled
+            std_rate = math.sqrt(max(total_sq / crawled - mean_rate * mean_rate, 0.0))
+            # 오늘 제목 수로 환산해서 비교 (빈도 단위로 보여 주고 MIN_STD도 같은 단위로 적용)
+            expected = mean_rate * titles_today
+            rows.append((term, count, expected, (count - expected) / max(std_rate * titles_today, MIN_STD)))
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows[:top_n]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_titles(source, category, titles, day=None):
+    """
+    제목들의 단어 빈도를 세어 그날 칸에 더한다 (처음 본 제목만 넘겨야 중복 집계되지 않는다).
+    새 제목이 없어도 크롤링한 날로 기록한다.
+    """
+    titles = list(titles)
+    freq = count_terms(titles, source=source) if titles else Counter()
+    with TrendStore() as store:
+        store.add_counts(source, category, freq, len(titles), day)
+
+
+def print_trends(source, category=None):
+    with TrendStore() as store:
+        print_rising_terms(store.rising_terms(source, category), label=f"[{source}]")
+
+
+def print_rising_terms(rows, label=""):
+    """rows: rising_terms() 결과 (None이면 기준 기간 데이터 없음)"""
+    if rows is None:
+        print(f"{label} 급상승 단어: 비교할 기준 기간 데이터가 아직 없습니다.".strip())
+        return
+    if not rows:
+        print(f"{label} 급상승 단어: 오늘 새 제목에서 최소 빈도를 넘은 단어가 없습니다.".strip())
+        return
+    print(f"{label} 급상승 단어".strip())
+    print(f"{'단어':<16} {'오늘':>6} {'기준평균':>8} {'z':>6}")
+    for term, count, mean, z in rows:
+        print(f"{term:<16} {count:>6} {mean:>8.1f} {z:>6.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="제목 단어 추세 조회")
+    parser.add_argument("--source", required=True, help="geeknews / okky / yozm")
+    parser.add_argument("--category", help="카테고리 (없으면 전체)")
+    parser.add_argument("--day", type=date.fromisoformat, help="기준 날짜 YYYY-MM-DD (기본: 오늘)")
+    parser.add_argument("--baseline", type=int, default=14, help="비교할 직전 기간 (일)")
+    parser.add_argument("--window", type=int, default=7, help="빈도 합계를 볼 최근 기간 (일)")
+    args = parser.parse_args()
+
+    with TrendStore() as store:
+        print_rising_terms(
+            store.rising_terms(args.source, args.category, args.day, baseline_days=args.baseline),
+            label=f"[{args.source}]",
+        )
+        print(f"\n최근 {args.window}일 상위 단어")
+        for term, total in store.window(args.source, args.window, args.category, args.day):
+            print(f"{term:<16} {total:>6}")
@@ -1,71 +1,27 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-import time
+import argparse
+import os
 import pandas as pd
 from datetime import datetime
-import re
-from collections import Counter
-from kiwipiepy import Kiwi
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 
-BASE = "https://yozm.wishket.com"
-
-def clean_kor(text):
-    # 한글/영문/숫자 + 공백만 허용
-    text = re.sub(r"[^가-힣A-Za-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
-# Kiwi 형태소 분석기 초기화
-kiwi = Kiwi()
-stopwords = set([
-    "하다", "되다", "있다", "같다", "보다", "이것", "저것", "그리고", "그러나",
-    "개발자", "시간", "코드", "분전", "일전", "요즘", "올해", "인기", "댓글", "이번"
-])
-
-def get_nouns(text):
-    # 1) 한국어 명사 추출 (Kiwi)
-    tokens = kiwi.tokenize(text)
-    korean_nouns = [token.form for token in tokens if token.tag.startswith("NN")]
-    korean_nouns = [n for n in korean_nouns if len(n) > 1 and n not in stopwords]
-
-    # 2) 영어 단어 추출 (2글자 이상)
-    english_words = re.findall(r'\b[A-Za-z]{2,}\b', text)
-    english_stopwords = set([
-        'the', 'is', 'are', 'was', 'were', 'of', 'to', 'and', 'in', 'on', 'at',
-        'show', 'gn', 'for', 'with', 'that', 'this', 'from', 'by'
-    ])
-    english_words = [w.upper() for w in english_words if w.lower() not in english_stopwords]
+from driver_pool import DriverPool
+from page_fetch import load_page, print_fetch_stats
+from pagination import paginate
+from seen_store import SeenStore, append_new_rows
+from text_analytics import count_terms, print_load_times, render_wordcloud
+from trend_store import print_trends, record_titles
 
-    # 3) 합치기
-    return korean_nouns + english_words
-
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+BASE = "https://yozm.wishket.com"
+ARTICLE_SELECTOR = 'a[href*="/magazine/detail/"]'
 
-def get_yozm_articles(driver, category, page=1):
-    # 카테고리별 리스트 페이지
+def get_yozm_articles(pool, category, page=1):
+    # 카테고리별 리스트 페이지 (HTTP로 먼저 받고, 글 링크가 없을 때만 브라우저 사용)
     url = f"{BASE}/magazine/list/{category}/?page={page}"
-    driver.get(url)
-    time.sleep(1)
-
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = load_page(url, ARTICLE_SELECTOR, pool)
     articles = []
     seen = set()  # 중복 방지
 
     # 각 글의 상세 페이지 링크: /magazine/detail/숫자/ 형식
-    for a in soup.select('a[href*="/magazine/detail/"]'):
+    for a in soup.select(ARTICLE_SELECTOR):
         href = a.get('href', '')
         if not href:
             continue
@@ -90,59 +46,73 @@ def get_yozm_articles(driver, category, page=1):
     return articles
 
 if __name__ == "__main__":
-    driver = get_driver()
+    parser = argparse.ArgumentParser(description="요즘IT 글 목록 크롤링")
+    parser.add_argument("--full", action="store_true",
+                        help="이전 수집 기록을 무시하고 전체를 다시 수집해서 타임스탬프 CSV로 저장")
+    args = parser.parse_args()
+    incremental = not args.full
+    
+    pool = DriverPool(size=1, max_pages=30, headless=True, lean=True)
+    store = SeenStore()
+    known = store.keys("yozm") if incremental else None
     
     # 크롤링할 카테고리 목록
     categories = ['develop', 'ai', 'itservice', 'plan', 'design', 'business']
     
     try:
         all_articles = []
-        max_pages = 10
+        max_pages = 50  # 안전장치용 상한 (보통 그 전에 목록 끝에서 멈춤)
         
         for category in categories:
-            for p in range(1, max_pages + 1):
-                articles = get_yozm_articles(driver, category, page=p)
-                
-                if not articles:
-                    break
-                
-                all_articles.extend(articles)
-                time.sleep(1)
+            # 요청 간격은 page_fetch의 yozm.wishket.com 토큰 버킷(초당 1건)이 맞춘다
+            def fetch_page(p, category=category):
+                return get_yozm_articles(pool, category, page=p)
+            
+            all_articles.extend(
+                paginate(fetch_page, item_key=lambda a: a['url'], max_pages=max_pages,
+                         known=known, label=f"YOZM {category}")
+            )
 
-        df = pd.DataFrame(all_articles)
-        
-        import os
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        new_df = pd.DataFrame(all_articles, columns=['category', 'title', 'url'])
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        filename = os.path.join(script_dir, f"yozm_articles_{timestamp}.csv")
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
         
-        all_text = " ".join(df['title'].astype(str).tolist())
-        cleaned = clean_kor(all_text)
-        tokens = get_nouns(cleaned)
-        freq = Counter(tokens)
+        if incremental:
+            # 누적 CSV 하나에 새 글만 덧붙이고, 워드클라우드는 누적 전체로 만든다
+            filename = os.path.join(script_dir, "yozm_articles.csv")
+            added = append_new_rows(new_df, filename, 'url')
+            print(f"새 글 {added}개 추가: {filename}")
+            df = pd.read_csv(filename, encoding='utf-8-sig') if os.path.exists(filename) else new_df
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = os.path.join(script_dir, f"yozm_articles_{timestamp}.csv")
+            new_df.to_csv(filename, index=False, encoding='utf-8-sig')
+            df = new_df
+        
+        # 추세 저장소에는 처음 본 글만 카테고리별로 오늘 날짜에 더한다 (--full이면 이미 본 글이 섞여 있음)
+        # 새 글이 없는 카테고리도 크롤링한 날로 남긴다
+        fresh_df = new_df if incremental else new_df[~new_df['url'].isin(store.keys("yozm"))]
+        for category in categories:
+            record_titles("yozm", category, fresh_df.loc[fresh_df['category'] == category, 'title'])
+        store.add("yozm", new_df['url'])
+        print_trends("yozm")
+        
+        freq = count_terms(df['title'], source="yozm")
         
         if freq:
-            wc = WordCloud(
-                font_path="C:/Windows/Fonts/malgun.ttf",
+            render_wordcloud(
+                freq,
+                os.path.join(script_dir, "yzitCrawling.png"),
                 width=1200,
                 height=800,
-                background_color="white",
+                figsize=(12, 8),
+                title="YOZM IT Magazine - Word Cloud",
                 colormap="viridis",
                 relative_scaling=0.3,
                 min_font_size=10
             )
-            wc.generate_from_frequencies(freq)
-            
-            plt.figure(figsize=(12, 8))
-            plt.imshow(wc, interpolation="bilinear")
-            plt.axis("off")
-            plt.title("YOZM IT Magazine - Word Cloud", fontsize=20, pad=20)
-            plt.tight_layout()
-            
-            wordcloud_file = os.path.join(script_dir, "yzitCrawling.png")
-            plt.savefig(wordcloud_file, dpi=200, bbox_inches='tight')
-            plt.show()
         
     finally:
-        driver.quit()
+        pool.close()
+        store.close()
+        print_fetch_stats()
+        print_load_times()